@@ -0,0 +1,152 @@
+import cProfile
+import json
+import os
+import time
+from collections import deque
+from datetime import datetime
+
+import pygame
+
+PROFILE_WINDOW = 300  # Frames kept per stage for the rolling statistics
+# Upper bounds (ms) of the histogram buckets; the last bucket is open-ended
+HISTOGRAM_BOUNDS = (0.25, 0.5, 1, 2, 4, 8, 16.7, 33.3)
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def histogram(values):
+    counts = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+    for value in values:
+        for i, bound in enumerate(HISTOGRAM_BOUNDS):
+            if value <= bound:
+                counts[i] += 1
+                break
+        else:
+            counts[-1] += 1
+    return counts
+
+class FrameProfiler:
+    # Lap timer for the main loop: mark(stage) charges the time since the
+    # previous mark to that stage. Every call returns immediately when disabled.
+    def __init__(self, enabled=False, window=PROFILE_WINDOW, output_dir='.'):
+        self.enabled = enabled
+        self.window = window
+        self.output_dir = output_dir
+        self.show_overlay = enabled
+        self.samples = {}
+        self.frame = {}
+        self.order = []
+        self.last = 0.0
+        self.frames = 0
+        self.cprofile = None
+        self.font = None
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.show_overlay = self.enabled
+        self.frame.clear()
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self.frame.clear()
+        self.last = time.perf_counter()
+
+    def mark(self, stage):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.frame[stage] = self.frame.get(stage, 0.0) + (now - self.last) * 1000
+        self.last = now
+
+    def end_frame(self):
+        if not self.enabled or not self.frame:
+            return
+        self.frame['frame'] = sum(self.frame.values())
+        for stage, ms in self.frame.items():
+            samples = self.samples.get(stage)
+            if samples is None:
+                samples = self.samples[stage] = deque(maxlen=self.window)
+                self.order.append(stage)
+            samples.append(ms)
+        self.frames += 1
+        self.frame.clear()
+
+    def stats(self):
+        result = {}
+        for stage in self.order:
+            values = sorted(self.samples[stage])
+            result[stage] = {
+                'mean_ms': round(sum(values) / len(values), 4),
+                'p50_ms': round(percentile(values, 0.50), 4),
+                'p95_ms': round(percentile(values, 0.95), 4),
+                'max_ms': round(values[-1], 4),
+                'histogram': histogram(values),
+            }
+        return result
+
+    def output_path(self, suffix):
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        return os.path.join(self.output_dir, f"wage_profile_{stamp}{suffix}")
+
+    def dump_json(self, path=None):
+        path = path or self.output_path('.json')
+        trace = {
+            'frames': self.frames,
+            'window': self.window,
+            'histogram_bounds_ms': HISTOGRAM_BOUNDS,
+            'stages': self.stats(),
+            'samples': {stage: list(self.samples[stage]) for stage in self.order},
+        }
+        with open(path, 'w') as f:
+            json.dump(trace, f, indent=2)
+        print(f"Wrote frame profile to {path}")
+        return path
+
+    def toggle_cprofile(self, path=None):
+        # First call starts a cProfile capture, the second stops it and writes it out
+        if self.cprofile is None:
+            self.cprofile = cProfile.Profile()
+            self.cprofile.enable()
+            print("cProfile capture started")
+            return None
+
+        self.cprofile.disable()
+        path = path or self.output_path('.prof')
+        self.cprofile.dump_stats(path)
+        self.cprofile = None
+        print(f"Wrote cProfile capture to {path}")
+        return path
+
+    def draw_overlay(self, surface):
+        # Opaque so it can be redrawn on top of dirty-rect frames without blending
+        if not self.show_overlay:
+            return None
+        if self.font is None:
+            self.font = pygame.font.Font(None, 18)
+
+        rows = [("stage", "mean", "p95", "max")]
+        for stage, stage_stats in self.stats().items():
+            rows.append((
+                stage, f"{stage_stats['mean_ms']:.2f}", f"{stage_stats['p95_ms']:.2f}", f"{stage_stats['max_ms']:.2f}"
+            ))
+        if self.cprofile is not None:
+            rows.append(("cProfile recording...", "", "", ""))
+
+        # Stage names left aligned, timings right aligned in fixed columns
+        line_height = self.font.get_linesize()
+        name_width = max(self.font.size(row[0])[0] for row in rows if row[1])
+        column_width = self.font.size("000.00")[0] + 8
+        width = max([name_width + column_width * 3] + [self.font.size(row[0])[0] for row in rows]) + 12
+        rect = pygame.Rect(4, 4, width, line_height * len(rows) + 8)
+        surface.fill((20, 20, 20), rect)
+        for i, row in enumerate(rows):
+            y = rect.y + 4 + i * line_height
+            surface.blit(self.font.render(row[0], True, (230, 230, 230)), (rect.x + 6, y))
+            for column, cell in enumerate(row[1:], 1):
+                text = self.font.render(cell, True, (230, 230, 230))
+                surface.blit(text, (rect.x + 6 + name_width + column_width * column - text.get_width(), y))
+        return rect
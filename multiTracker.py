@@ -0,0 +1,253 @@
+import argparse
+import random
+import sys
+from datetime import datetime, timedelta
+
+import pygame
+
+import wageTracker
+from shiftTable import ShiftTable, load_roster
+from wageEngine import (
+    NO_BRACKETS, NO_RATE_RULES, format_cents, load_milestone_items, load_rate_schedule, load_tax_schedule,
+)
+from wageTracker import (
+    BLACK, DARK_GREEN, FPS, GRAY, GREEN, HEIGHT, LIGHT_GRAY, LIGHT_GREEN, MILESTONES_PATH, RATE_RULES_PATH,
+    TAX_BRACKETS_PATH, WHITE, WIDTH, get_font, get_ticks, init_display, render_text,
+)
+
+# Supervisor view: one scrolling grid with a row per worker. Every shift lives
+# in a ShiftTable, so a frame costs one vectorized update plus the text of the
+# rows that are actually on screen.
+ROW_HEIGHT = 40
+HEADER_HEIGHT = 100
+FOOTER_HEIGHT = 28
+SCROLLBAR_WIDTH = 8
+GRID_RECT = pygame.Rect(0, HEADER_HEIGHT, WIDTH, HEIGHT - HEADER_HEIGHT - FOOTER_HEIGHT)
+HIGHLIGHT_MS = 1000  # How long a row stays highlighted after its minute ticks
+HIGHLIGHT_COLOR = (187, 247, 208)
+DEMO_SHIFTS = 200
+
+# Right edges of the numeric columns; the worker column is left aligned
+TIME_RIGHT = 330
+EARNED_RIGHT = 450
+AFTER_TAX_RIGHT = WIDTH - 24
+
+def demo_roster(count, now=None):
+    now = now or datetime.now()
+    return [
+        (f"Worker {i + 1:03d}", round(random.uniform(15, 60), 2), random.choice((0.1, 0.15, 0.2, 0.25, 0.3)),
+         now - timedelta(minutes=random.randint(0, 8 * 60)))
+        for i in range(count)
+    ]
+
+class MultiTracker:
+    def __init__(self, table, clock=datetime.now):
+        self.table = table
+        self.clock = clock
+        self.scroll = 0
+        self.highlights = {}  # row -> tick when its highlight ends
+        self.needs_redraw = True
+
+    @property
+    def max_scroll(self):
+        return max(0, self.table.count * ROW_HEIGHT - GRID_RECT.height)
+
+    def scroll_by(self, pixels):
+        scroll = min(self.max_scroll, max(0, self.scroll + pixels))
+        if scroll != self.scroll:
+            self.scroll = scroll
+            self.needs_redraw = True
+
+    def visible_rows(self):
+        first = self.scroll // ROW_HEIGHT
+        last = min(self.table.count, (self.scroll + GRID_RECT.height) // ROW_HEIGHT + 1)
+        return first, last
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEWHEEL:
+            self.scroll_by(-event.y * ROW_HEIGHT)
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_UP:
+                self.scroll_by(-ROW_HEIGHT)
+            elif event.key == pygame.K_DOWN:
+                self.scroll_by(ROW_HEIGHT)
+            elif event.key == pygame.K_PAGEUP:
+                self.scroll_by(-GRID_RECT.height)
+            elif event.key == pygame.K_PAGEDOWN:
+                self.scroll_by(GRID_RECT.height)
+            elif event.key == pygame.K_HOME:
+                self.scroll_by(-self.scroll)
+            elif event.key == pygame.K_END:
+                self.scroll_by(self.max_scroll)
+        elif event.type == pygame.VIDEOEXPOSE:
+            self.needs_redraw = True
+
+    def update(self):
+        ticked, unlocked = self.table.update(self.clock())
+        now = get_ticks()
+
+        # Only rows on screen need a highlight; the header totals change with any tick
+        first, last = self.visible_rows()
+        for row in ticked[(ticked >= first) & (ticked < last)].tolist():
+            self.highlights[row] = now + HIGHLIGHT_MS
+        if self.highlights:
+            for row in [row for row, until in self.highlights.items() if until <= now]:
+                del self.highlights[row]
+            self.needs_redraw = True
+        if len(ticked) or len(unlocked):
+            self.needs_redraw = True
+
+    def draw_header(self, surface):
+        table = self.table
+        n = table.count
+        title = render_text(wageTracker.title_font, "Shift Floor", True, BLACK)
+        surface.blit(title, (20, 14))
+
+        earned = format_cents(int(table.earnings_cents[:n].sum()))
+        after_tax = format_cents(int(table.after_tax_cents().sum()))
+        milestones = int(table.next_milestone[:n].sum())
+        totals = f"{n} on shift   ${earned} earned   ${after_tax} after tax   {milestones} milestones"
+        totals_surf = render_text(wageTracker.small_font, totals, True, DARK_GREEN)
+        surface.blit(totals_surf, (20, 52))
+
+        label_font = get_font(20)
+        for text, right in (("Time", TIME_RIGHT), ("Earned", EARNED_RIGHT), ("After Tax", AFTER_TAX_RIGHT)):
+            label = render_text(label_font, text, True, GRAY)
+            surface.blit(label, (right - label.get_width(), HEADER_HEIGHT - 20))
+        surface.blit(render_text(label_font, "Worker", True, GRAY), (20, HEADER_HEIGHT - 20))
+
+    def draw_rows(self, surface):
+        table = self.table
+        first, last = self.visible_rows()
+        if first >= last:
+            return
+
+        # Pull everything the visible rows need out of the table in one go
+        rows = slice(first, last)
+        minutes = table.minutes[rows].tolist()
+        earnings = table.earnings_cents[rows].tolist()
+        after_tax = table.after_tax_cents(rows).tolist()
+        milestone_indices, etas = table.next_milestone_eta(rows)
+        milestone_indices = milestone_indices.tolist()
+        etas = etas.tolist()
+
+        name_font = get_font(24)
+        detail_font = get_font(18)
+        value_font = get_font(24)
+        row_width = WIDTH - 16 - SCROLLBAR_WIDTH
+        surface.set_clip(GRID_RECT)
+        for i, row in enumerate(range(first, last)):
+            y = GRID_RECT.y + row * ROW_HEIGHT - self.scroll
+            color = HIGHLIGHT_COLOR if row in self.highlights else WHITE
+            surface.fill(color, (8, y + 2, row_width, ROW_HEIGHT - 4))
+
+            surface.blit(render_text(name_font, table.names[row], True, BLACK), (20, y + 5))
+            item_name = table.milestone_name(milestone_indices[i])
+            if item_name is None:
+                detail = "every milestone unlocked"
+            elif etas[i] < 0:
+                detail = f"{item_name} out of reach"
+            else:
+                detail = f"{item_name} in {etas[i]}m"
+            surface.blit(render_text(detail_font, detail, True, GRAY), (20, y + 23))
+
+            h, m = divmod(minutes[i], 60)
+            for text, right, text_color in (
+                (f"{h}h {m:02d}m", TIME_RIGHT, BLACK),
+                (f"${format_cents(earnings[i])}", EARNED_RIGHT, GREEN),
+                (f"${format_cents(after_tax[i])}", AFTER_TAX_RIGHT, DARK_GREEN),
+            ):
+                value = render_text(value_font, text, True, text_color)
+                surface.blit(value, (right - value.get_width(), y + (ROW_HEIGHT - value.get_height()) // 2))
+        surface.set_clip(None)
+
+    def draw_scrollbar(self, surface):
+        total = self.table.count * ROW_HEIGHT
+        if total <= GRID_RECT.height:
+            return
+        track = pygame.Rect(WIDTH - SCROLLBAR_WIDTH - 4, GRID_RECT.y, SCROLLBAR_WIDTH, GRID_RECT.height)
+        thumb_height = max(20, track.height * GRID_RECT.height // total)
+        thumb_y = track.y + (track.height - thumb_height) * self.scroll // self.max_scroll
+        pygame.draw.rect(surface, LIGHT_GRAY, track, border_radius=4)
+        pygame.draw.rect(surface, GRAY, (track.x, thumb_y, track.width, thumb_height), border_radius=4)
+
+    def draw(self, surface):
+        surface.fill(LIGHT_GREEN)
+        self.draw_header(surface)
+        self.draw_rows(surface)
+        self.draw_scrollbar(surface)
+        hint = render_text(get_font(18), "Mouse wheel, arrows, PgUp/PgDn, Home/End to scroll", True, GRAY)
+        surface.blit(hint, hint.get_rect(center=(WIDTH // 2, HEIGHT - FOOTER_HEIGHT // 2)))
+        self.needs_redraw = False
+
+    def run(self):
+        # The grid is laid out in pixels, so it always runs unscaled
+        screen = init_display('window', 1)
+        pygame.display.set_caption("Shift Floor")
+        running = True
+        while running:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                self.handle_event(event)
+
+            self.update()
+            if self.needs_redraw:
+                self.draw(screen)
+                pygame.display.flip()
+            wageTracker.clock.tick(FPS)
+
+        pygame.quit()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Live earnings for many concurrent shifts")
+    parser.add_argument('roster', nargs='?', help="CSV or JSON roster with name, wage, tax (%%) and start (HH:MM)")
+    parser.add_argument('--demo', type=int, default=DEMO_SHIFTS, help="random shifts to show when no roster is given")
+    parser.add_argument('--milestones', default=MILESTONES_PATH, help="CSV or JSON milestone catalog")
+    parser.add_argument('--tax-brackets', default=TAX_BRACKETS_PATH, help="CSV or JSON tax bracket layers")
+    parser.add_argument('--rate-rules', default=RATE_RULES_PATH, help="JSON overtime and shift differential rules")
+    args = parser.parse_args(argv)
+
+    milestone_items = None
+    if args.milestones:
+        try:
+            milestone_items = load_milestone_items(args.milestones)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Could not load milestones from {args.milestones}: {e}")
+
+    tax_schedule = NO_BRACKETS
+    if args.tax_brackets:
+        try:
+            tax_schedule = load_tax_schedule(args.tax_brackets)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Could not load tax brackets from {args.tax_brackets}: {e}")
+            return 1
+
+    rate_schedule = NO_RATE_RULES
+    if args.rate_rules:
+        try:
+            rate_schedule = load_rate_schedule(args.rate_rules)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Could not load rate rules from {args.rate_rules}: {e}")
+            return 1
+
+    if args.roster:
+        try:
+            roster = load_roster(args.roster)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Could not load roster from {args.roster}: {e}")
+            return 1
+    else:
+        roster = demo_roster(args.demo)
+
+    table = ShiftTable(
+        capacity=max(len(roster), 1), milestone_items=milestone_items, tax_schedule=tax_schedule,
+        rate_schedule=rate_schedule,
+    )
+    for name, wage, tax_rate, start_time in roster:
+        table.add(name, wage, tax_rate, start_time)
+    MultiTracker(table).run()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,269 @@
+import argparse
+import csv
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from itertools import islice
+from operator import itemgetter
+
+from wageEngine import (
+    NO_BRACKETS, NO_RATE_RULES, format_cents, load_rate_schedule, load_tax_schedule, minute_earnings_cents,
+    to_basis_points, to_cents, whole_minutes,
+)
+
+# Runs completed shifts from a payroll export through the tracker's earnings
+# rules. Input is read and written one chunk at a time, so memory stays flat
+# however long the file is.
+CHUNK_SIZE = 20000
+REQUIRED_FIELDS = ('clock_in', 'clock_out', 'wage', 'tax_rate')
+OUTPUT_FIELDS = ('line', 'worker', 'clock_in', 'clock_out', 'minutes', 'earnings', 'tax', 'after_tax')
+ERROR_REPORT_LIMIT = 10
+
+# Exports repeat the same few wages and tax rates, so the Decimal conversions
+# are memoized per raw value
+wage_cents = lru_cache(maxsize=4096)(to_cents)
+tax_basis_points = lru_cache(maxsize=256)(to_basis_points)
+
+def parse_timestamp(value):
+    # ISO 8601 text (with dashes in the date) or seconds since the epoch
+    if value is None:
+        raise ValueError("missing timestamp")
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value)
+    if '-' in value:
+        return datetime.fromisoformat(value.strip())
+    return datetime.fromtimestamp(float(value))
+
+def read_shifts(path):
+    # Yields (line, worker, clock_in, clock_out, wage, tax_rate) with the raw
+    # field values. CSV needs a header naming the columns; .jsonl/.ndjson has
+    # one object per line. A plain .json array has to be loaded whole.
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.json':
+        with open(path) as f:
+            rows = json.load(f)
+        for line, row in enumerate(rows, 1):
+            yield (line, str(row.get('worker', '')), *(row.get(name) for name in REQUIRED_FIELDS))
+        return
+    if ext in ('.jsonl', '.ndjson'):
+        with open(path) as f:
+            for line, text in enumerate(f, 1):
+                if not text.strip():
+                    continue
+                try:
+                    row = json.loads(text)
+                except ValueError:
+                    yield line, '', None, None, None, None
+                    continue
+                yield (line, str(row.get('worker', '')), *(row.get(name) for name in REQUIRED_FIELDS))
+        return
+
+    with open(path, newline='') as f:
+        reader = csv.reader(f)
+        header = [name.strip().lower() for name in next(reader, [])]
+        missing = [name for name in REQUIRED_FIELDS if name not in header]
+        if missing:
+            raise ValueError(f"{path} is missing the column(s): {', '.join(missing)}")
+        indices = [header.index(name) for name in REQUIRED_FIELDS]
+        if 'worker' in header:
+            prefix = ()
+            pick = itemgetter(header.index('worker'), *indices)
+        else:
+            prefix = ('',)
+            pick = itemgetter(*indices)
+
+        for line, row in enumerate(reader, 2):
+            if not row:
+                continue
+            try:
+                yield (line,) + prefix + pick(row)
+            except IndexError:
+                yield line, '', None, None, None, None
+
+def pay_shift(clock_in, clock_out, wage, tax_rate, tax_schedule=NO_BRACKETS, rate_schedule=NO_RATE_RULES):
+    # Returns (start, end, minutes, earnings cents, tax cents) or raises
+    # ValueError/TypeError. The row's tax_rate is withheld on top of any brackets
+    start = parse_timestamp(clock_in)
+    end = parse_timestamp(clock_out)
+    cents = wage_cents(wage)
+    basis_points = tax_basis_points(tax_rate)
+    if end < start:
+        raise ValueError("clock-out is before clock-in")
+    if cents < 0 or not 0 <= basis_points <= 10000:
+        raise ValueError("wage must be positive and tax_rate between 0 and 1")
+
+    minutes = whole_minutes(start, end)
+    if rate_schedule:
+        # Segments only need to cover this shift
+        earnings = rate_schedule.compile(cents / 100, start, minutes + 1).earnings_cents(minutes)
+    else:
+        earnings = minute_earnings_cents(cents, minutes)
+    tax = tax_schedule.tax_cents(earnings, basis_points)
+    return start, end, minutes, earnings, tax
+
+class PayrollTotals:
+    # Sums are whole cents, so totals are exact however many shifts are added
+    def __init__(self):
+        self.shifts = 0
+        self.minutes = 0
+        self.earnings = 0
+        self.tax = 0
+
+    def add(self, minutes, earnings, tax):
+        self.shifts += 1
+        self.minutes += minutes
+        self.earnings += earnings
+        self.tax += tax
+
+    def merge(self, other):
+        self.shifts += other.shifts
+        self.minutes += other.minutes
+        self.earnings += other.earnings
+        self.tax += other.tax
+
+    def as_dict(self):
+        return {
+            'shifts': self.shifts,
+            'hours': round(self.minutes / 60, 4),
+            'earnings': self.earnings / 100,
+            'tax': self.tax / 100,
+            'after_tax': (self.earnings - self.tax) / 100,
+        }
+
+def process_chunk(rows, with_rows=True, by_worker=False, tax_schedule=NO_BRACKETS, rate_schedule=NO_RATE_RULES):
+    # Runs in the pool workers; returns output rows, totals, per-worker totals
+    # and (line, message) errors for one chunk
+    output = []
+    totals = PayrollTotals()
+    workers = {}
+    errors = []
+    for line, worker, clock_in, clock_out, wage, tax_rate in rows:
+        try:
+            start, end, minutes, earnings, tax = pay_shift(
+                clock_in, clock_out, wage, tax_rate, tax_schedule, rate_schedule
+            )
+        except (ValueError, TypeError) as e:
+            errors.append((line, str(e)))
+            continue
+
+        totals.add(minutes, earnings, tax)
+        if by_worker:
+            worker_totals = workers.get(worker)
+            if worker_totals is None:
+                worker_totals = workers[worker] = PayrollTotals()
+            worker_totals.add(minutes, earnings, tax)
+        if with_rows:
+            output.append((
+                line, worker, start.isoformat(), end.isoformat(), minutes,
+                format_cents(earnings), format_cents(tax), format_cents(earnings - tax),
+            ))
+    return output, totals, workers, errors
+
+def iter_chunks(rows, chunk_size):
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def map_chunks(chunks, jobs, with_rows, by_worker, tax_schedule, rate_schedule):
+    # At most two chunks per process are in flight, which bounds memory and
+    # still returns results in input order
+    with ProcessPoolExecutor(jobs) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(
+                process_chunk, chunk, with_rows, by_worker, tax_schedule, rate_schedule
+            ))
+            if len(pending) >= jobs * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def run_batch(path, output=None, jobs=1, chunk_size=CHUNK_SIZE, by_worker=False, tax_schedule=NO_BRACKETS,
+              rate_schedule=NO_RATE_RULES):
+    # Writes per-shift rows to the output file object (if any) and returns the summary
+    totals = PayrollTotals()
+    workers = {}
+    rejected = 0
+    writer = None
+    if output is not None:
+        writer = csv.writer(output)
+        writer.writerow(OUTPUT_FIELDS)
+
+    chunks = iter_chunks(read_shifts(path), chunk_size)
+    with_rows = writer is not None
+    if jobs > 1:
+        results = map_chunks(chunks, jobs, with_rows, by_worker, tax_schedule, rate_schedule)
+    else:
+        results = (process_chunk(chunk, with_rows, by_worker, tax_schedule, rate_schedule) for chunk in chunks)
+
+    for rows, chunk_totals, chunk_workers, errors in results:
+        if writer is not None:
+            writer.writerows(rows)
+        totals.merge(chunk_totals)
+        for worker, worker_totals in chunk_workers.items():
+            if worker in workers:
+                workers[worker].merge(worker_totals)
+            else:
+                workers[worker] = worker_totals
+        for line, message in errors:
+            if rejected < ERROR_REPORT_LIMIT:
+                print(f"Skipping line {line}: {message}", file=sys.stderr)
+            rejected += 1
+
+    summary = totals.as_dict()
+    summary['rejected'] = rejected
+    if by_worker:
+        summary['workers'] = {worker: workers[worker].as_dict() for worker in sorted(workers)}
+    return summary
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch payroll over a file of completed shifts")
+    parser.add_argument('shifts', help="CSV (with a header), JSON or JSON Lines file with clock_in, clock_out, "
+                                       "wage and tax_rate (0-1) per shift, plus an optional worker")
+    parser.add_argument('--output', help="write per-shift results as CSV to this file ('-' for stdout)")
+    parser.add_argument('--summary', help="write the aggregated JSON summary to this file instead of stdout")
+    parser.add_argument('--by-worker', action='store_true', help="include totals per worker in the summary")
+    parser.add_argument('--tax-brackets', help="CSV or JSON tax bracket layers applied before each row's tax_rate")
+    parser.add_argument('--rate-rules', help="JSON overtime and shift differential rules")
+    parser.add_argument('--jobs', type=int, default=1, help="worker processes (0 for one per CPU)")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help="shifts per chunk handed to a worker")
+    args = parser.parse_args(argv)
+
+    jobs = args.jobs or os.cpu_count() or 1
+    output = None
+    try:
+        if args.output == '-':
+            output = sys.stdout
+        elif args.output:
+            output = open(args.output, 'w', newline='')
+        tax_schedule = load_tax_schedule(args.tax_brackets) if args.tax_brackets else NO_BRACKETS
+        rate_schedule = load_rate_schedule(args.rate_rules) if args.rate_rules else NO_RATE_RULES
+        summary = run_batch(
+            args.shifts, output, jobs, max(1, args.chunk_size), args.by_worker, tax_schedule, rate_schedule
+        )
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Payroll run failed: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if output is not None and output is not sys.stdout:
+            output.close()
+
+    text = json.dumps(summary, indent=2)
+    if args.summary:
+        with open(args.summary, 'w') as f:
+            f.write(text + '\n')
+    elif args.output == '-':
+        print(text, file=sys.stderr)
+    else:
+        print(text)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
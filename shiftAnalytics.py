@@ -0,0 +1,137 @@
+import math
+from datetime import date, timedelta
+
+import numpy as np
+
+from wageEngine import to_cents
+
+EPOCH = date(1970, 1, 1)
+
+# Local calendar day and month of each shift are worked out by SQLite while
+# loading, so grouping never needs per-row Python date handling. Money is
+# summed in integer cents. Each shift's recorded tax is used as is; shifts
+# saved before it was recorded fall back to earnings * tax_rate, rounded half
+# up the same way record_values() does it for shifts appended later.
+EARNINGS_CENTS = "CAST(ROUND(earnings * 100) AS INTEGER)"
+TAX_CENTS = f"COALESCE(CAST(ROUND(tax * 100) AS INTEGER), CAST({EARNINGS_CENTS} * tax_rate + 0.5 AS INTEGER))"
+ANALYTICS_COLUMNS = (
+    "CAST(strftime('%s', date(start_ts, 'unixepoch', 'localtime')) AS INTEGER) / 86400, "
+    "CAST(strftime('%Y', start_ts, 'unixepoch', 'localtime') AS INTEGER) * 12 "
+    "+ CAST(strftime('%m', start_ts, 'unixepoch', 'localtime') AS INTEGER) - 1, "
+    f"{EARNINGS_CENTS}, {EARNINGS_CENTS} - {TAX_CENTS}, "
+    "hours, json_array_length(milestones)"
+)
+# Earnings and after-tax are cents and milestones a count, all int64; hours are float
+VALUE_FIELDS = ('earnings', 'after_tax', 'hours', 'milestones')
+VALUE_DTYPES = (np.int64, np.int64, np.float64, np.int64)
+
+def week_of(day):
+    # Weeks start on Monday; day 0 (1970-01-01) was a Thursday
+    return (day + 3) // 7
+
+def week_start(week):
+    return EPOCH + timedelta(days=int(week) * 7 - 3)
+
+def month_start(month):
+    year, index = divmod(int(month), 12)
+    return date(year, index + 1, 1)
+
+def record_keys(record):
+    day = (record.start.date() - EPOCH).days
+    return day, record.start.year * 12 + record.start.month - 1
+
+def record_values(record):
+    cents = to_cents(record.earnings)
+    if record.tax is None:
+        tax = math.floor(cents * record.tax_rate + 0.5)
+    else:
+        tax = to_cents(record.tax)
+    return cents, cents - tax, record.hours, len(record.milestones)
+
+def sum_by(inverse, column, count, dtype):
+    sums = np.zeros(count, dtype=dtype)
+    np.add.at(sums, inverse, column.astype(dtype))
+    return sums
+
+class PeriodBins:
+    # Per-period sums kept as sorted key/value arrays, one array per field:
+    # built with one vectorized group-by, then updated in place as shifts are appended
+    def __init__(self, keys, values):
+        if len(keys):
+            self.keys, inverse = np.unique(keys, return_inverse=True)
+            self.shifts = np.bincount(inverse, minlength=len(self.keys)).astype(np.int64)
+            self.values = [
+                sum_by(inverse, column, len(self.keys), dtype) for column, dtype in zip(values, VALUE_DTYPES)
+            ]
+        else:
+            self.keys = np.zeros(0, dtype=np.int64)
+            self.shifts = np.zeros(0, dtype=np.int64)
+            self.values = [np.zeros(0, dtype=dtype) for dtype in VALUE_DTYPES]
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, key, values):
+        index = int(np.searchsorted(self.keys, key))
+        if index == len(self.keys) or self.keys[index] != key:
+            self.keys = np.insert(self.keys, index, key)
+            self.shifts = np.insert(self.shifts, index, 0)
+            self.values = [np.insert(column, index, 0) for column in self.values]
+        self.shifts[index] += 1
+        for column, value in zip(self.values, values):
+            column[index] += value
+
+    def column(self, field):
+        return self.values[VALUE_FIELDS.index(field)]
+
+    def recent(self, count, field='earnings'):
+        # (keys, sums of field) for the most recent `count` periods
+        return self.keys[-count:], self.column(field)[-count:]
+
+class ShiftAnalytics:
+    def __init__(self, days, months, values):
+        days = np.asarray(days, dtype=np.int64)
+        months = np.asarray(months, dtype=np.int64)
+        values = [np.asarray(column, dtype=dtype).reshape(len(days)) for column, dtype in zip(values, VALUE_DTYPES)]
+        self.shift_count = len(days)
+        self.totals = [column.sum(dtype=dtype).item() for column, dtype in zip(values, VALUE_DTYPES)]
+        self.weekly = PeriodBins(week_of(days), values)
+        self.monthly = PeriodBins(months, values)
+
+    @classmethod
+    def from_history(cls, history, since=None, until=None):
+        # Rows come back as Python ints (and floats for hours), so no cent
+        # ever passes through a float
+        rows = history.iter_rows(since, until, columns=ANALYTICS_COLUMNS).fetchall()
+        columns = list(zip(*rows)) or [()] * (2 + len(VALUE_FIELDS))
+        return cls(columns[0], columns[1], columns[2:])
+
+    def append(self, records):
+        # Folds newly stored shifts into the totals and bins without reloading
+        for record in records:
+            day, month = record_keys(record)
+            values = record_values(record)
+            self.shift_count += 1
+            self.totals = [total + value for total, value in zip(self.totals, values)]
+            self.weekly.add(week_of(day), values)
+            self.monthly.add(month, values)
+
+    def total(self, field):
+        return self.totals[VALUE_FIELDS.index(field)]
+
+    def summary(self):
+        # Money in integer cents; format with format_cents
+        earnings = self.total('earnings')
+        after_tax = self.total('after_tax')
+        hours = self.total('hours')
+        milestones = self.total('milestones')
+        return {
+            'shifts': self.shift_count,
+            'earnings_cents': earnings,
+            'after_tax_cents': after_tax,
+            'tax_cents': earnings - after_tax,
+            'hours': hours,
+            'effective_hourly': earnings / 100 / hours if hours else 0.0,
+            'milestones': milestones,
+            'milestones_per_shift': milestones / self.shift_count if self.shift_count else 0.0,
+        }
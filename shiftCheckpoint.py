@@ -0,0 +1,111 @@
+import mmap
+import os
+import struct
+import threading
+import zlib
+from datetime import datetime, timedelta
+
+# In-progress shift state lives in a small fixed-size file that is memory
+# mapped and updated in place, so a checkpoint is a struct.pack_into and the
+# process can die at any point without losing more than the current minute.
+DEFAULT_CHECKPOINT_PATH = os.path.join(os.path.expanduser('~'), '.wage_tracker', 'checkpoint.bin')
+CHECKPOINT_PATH = os.environ.get('WAGE_TRACKER_CHECKPOINT', DEFAULT_CHECKPOINT_PATH)
+# A checkpoint last written longer ago than this is a leftover from a crash,
+# not a shift to resume
+CHECKPOINT_MAX_AGE = timedelta(hours=float(os.environ.get('WAGE_TRACKER_CHECKPOINT_MAX_AGE', 12)))
+
+MAGIC = b'WTCK'
+# magic, active flag, start, hourly wage, tax rate, last counted minute,
+# unlocked milestone count, time of checkpoint
+RECORD = struct.Struct('<4sB3xdddqqd')
+CHECKSUM = struct.Struct('<I')
+CHECKPOINT_SIZE = 64
+
+class ShiftCheckpoint:
+    def __init__(self, path=CHECKPOINT_PATH):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.flusher = None
+        self.flush_pending = False
+        self.flush_lock = threading.Lock()
+
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if os.fstat(fd).st_size != CHECKPOINT_SIZE:
+                os.ftruncate(fd, CHECKPOINT_SIZE)
+            self.mm = mmap.mmap(fd, CHECKPOINT_SIZE)
+        finally:
+            os.close(fd)
+
+    def write(self, active, start_ts, hourly_wage, tax_rate, last_minute, unlocked, saved_ts):
+        RECORD.pack_into(
+            self.mm, 0, MAGIC, active, start_ts, hourly_wage, tax_rate, last_minute, unlocked, saved_ts
+        )
+        CHECKSUM.pack_into(self.mm, RECORD.size, zlib.crc32(self.mm[:RECORD.size]))
+        self.flush_async()
+
+    def flush_async(self):
+        # Writing into the mapping already survives a process crash; msync for
+        # power loss happens off the render thread. A write that lands while a
+        # flush is running queues one more, so the latest state always gets synced
+        with self.flush_lock:
+            if self.flusher is not None:
+                self.flush_pending = True
+                return
+            self.flusher = threading.Thread(target=self.flush_loop, daemon=True)
+            self.flusher.start()
+
+    def flush_loop(self):
+        while True:
+            self.sync()
+            with self.flush_lock:
+                if not self.flush_pending:
+                    self.flusher = None
+                    return
+                self.flush_pending = False
+
+    def sync(self):
+        self.mm.flush()
+
+    def save(self, engine, now=None):
+        now = now or engine.clock()
+        self.write(
+            1, engine.start_time.timestamp(), engine.hourly_wage, engine.tax_rate,
+            engine.last_update_minute, engine.milestones.next_index, now.timestamp(),
+        )
+
+    def clear(self):
+        self.write(0, 0.0, 0.0, 0.0, -1, 0, datetime.now().timestamp())
+
+    def load(self):
+        # Returns the saved shift as a dict, or None if nothing valid is active
+        data = self.mm[:RECORD.size]
+        (checksum,) = CHECKSUM.unpack_from(self.mm, RECORD.size)
+        if checksum != zlib.crc32(data):
+            return None
+
+        magic, active, start_ts, hourly_wage, tax_rate, last_minute, unlocked, saved_ts = RECORD.unpack(data)
+        if magic != MAGIC or not active:
+            return None
+        return {
+            'start_time': datetime.fromtimestamp(start_ts),
+            'hourly_wage': hourly_wage,
+            'tax_rate': tax_rate,
+            'last_update_minute': last_minute,
+            'unlocked': unlocked,
+            'saved_at': datetime.fromtimestamp(saved_ts),
+        }
+
+    def close(self):
+        if self.mm is None:
+            return
+        flusher = self.flusher
+        if flusher is not None:
+            flusher.join()
+        self.mm.flush()
+        self.mm.close()
+        self.mm = None
+
+def is_stale(state, now, max_age=CHECKPOINT_MAX_AGE):
+    return now - state['saved_at'] > max_age
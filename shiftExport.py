@@ -0,0 +1,273 @@
+import argparse
+import csv
+import os
+import sys
+from datetime import datetime
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet/Arrow output falls back to a .npy structured array
+    pa = None
+    pq = None
+
+from shiftHistory import HISTORY_PATH, ShiftHistory
+from wageEngine import NO_RATE_RULES, ShiftRates, format_cents, load_rate_schedule, to_cents
+
+# Shift history and per-minute earnings timelines, streamed out of the history
+# database one batch at a time. Every format gets the same columns; money is
+# in integer cents and times are seconds since the epoch, except in the shift
+# CSV, which is written for people and uses local ISO times and dollars.
+# Shift rows are what was recorded; timelines are not stored anywhere and are
+# recomputed from each shift's wage and the rate rules given to the export.
+EXPORT_BATCH_SIZE = 4096  # Shifts fetched from SQLite per batch
+DEFAULT_EXPORT_DIR = os.path.join(os.path.expanduser('~'), '.wage_tracker', 'exports')
+EXPORT_DIR = os.environ.get('WAGE_TRACKER_EXPORT_DIR', DEFAULT_EXPORT_DIR)
+COLUMNAR_EXTENSIONS = ('.parquet', '.arrow', '.npy')
+
+# Minutes are counted by SQLite, so the row count used to size a .npy file and
+# the rows generated afterwards can never disagree
+SHIFT_MINUTES = "CAST((end_ts - start_ts) / 60 AS INTEGER)"
+EXPORT_COLUMNS = (
+    f"id, start_ts, end_ts, hourly_wage, tax_rate, {SHIFT_MINUTES}, earnings, json_array_length(milestones), "
+    "CAST(ROUND(tax * 100) AS INTEGER)"
+)
+
+SHIFT_DTYPE = np.dtype([
+    ('id', 'i8'), ('start', 'f8'), ('end', 'f8'), ('hourly_wage_cents', 'i8'), ('tax_rate', 'f8'),
+    ('minutes', 'i8'), ('earnings_cents', 'i8'), ('tax_cents', 'i8'), ('after_tax_cents', 'i8'),
+    ('milestones', 'i4'),
+])
+SHIFT_CSV_FIELDS = (
+    'id', 'start', 'end', 'hourly_wage', 'tax_rate', 'minutes', 'earnings', 'tax', 'after_tax', 'milestones',
+)
+# One row per minute the shift crossed: the hourly rate that paid for that
+# minute and the running total, recomputed the way the tracker counts them
+# minute by minute under the rate rules passed to timeline_array()
+TIMELINE_DTYPE = np.dtype([
+    ('shift_id', 'i8'), ('minute', 'i4'), ('rate_cents', 'i8'), ('earnings_cents', 'i8'),
+])
+
+def iter_batches(history, since=None, until=None, batch_size=EXPORT_BATCH_SIZE):
+    rows = history.iter_rows(since, until, columns=EXPORT_COLUMNS)
+    while True:
+        batch = rows.fetchmany(batch_size)
+        if not batch:
+            return
+        yield batch
+
+def count_rows(history, since=None, until=None, timeline=False):
+    column = f"COALESCE(SUM(MAX({SHIFT_MINUTES}, 0)), 0)" if timeline else "COUNT(*)"
+    return history.iter_rows(since, until, columns=column).fetchone()[0]
+
+def shift_array(batch):
+    ids, starts, ends, wages, tax_rates, minutes, earnings, milestones, taxes = zip(*batch)
+    shifts = np.zeros(len(batch), dtype=SHIFT_DTYPE)
+    shifts['id'] = ids
+    shifts['start'] = starts
+    shifts['end'] = ends
+    shifts['hourly_wage_cents'] = np.round(np.array(wages) * 100)
+    shifts['tax_rate'] = tax_rates
+    shifts['minutes'] = minutes
+    shifts['earnings_cents'] = np.round(np.array(earnings) * 100)
+    # Shifts saved before the withheld tax was recorded fall back to their
+    # rate, rounded half up as the analytics do
+    recomputed = np.floor(shifts['earnings_cents'] * shifts['tax_rate'] + 0.5).astype(np.int64).tolist()
+    shifts['tax_cents'] = [fallback if tax is None else tax for tax, fallback in zip(taxes, recomputed)]
+    shifts['after_tax_cents'] = shifts['earnings_cents'] - shifts['tax_cents']
+    shifts['milestones'] = milestones
+    return shifts
+
+def timeline_array(batch, rate_schedule=NO_RATE_RULES):
+    total = sum(max(row[5], 0) for row in batch)
+    timeline = np.zeros(total, dtype=TIMELINE_DTYPE)
+    offset = 0
+    for shift_id, start_ts, _, wage, _, minutes, _, _, _ in batch:
+        if minutes <= 0:
+            continue
+        if rate_schedule:
+            rates = rate_schedule.compile(wage, datetime.fromtimestamp(start_ts), minutes + 1)
+        else:
+            rates = ShiftRates((0,), (to_cents(wage),))
+        # ShiftRates.rate_cents/earnings_cents for every minute at once
+        minute = np.arange(1, minutes + 1)
+        starts = np.array(rates.starts)
+        segment_rates = np.array(rates.rates)
+        segment = np.searchsorted(starts, minute, side='right') - 1
+        rows = timeline[offset:offset + minutes]
+        rows['shift_id'] = shift_id
+        rows['minute'] = minute
+        rows['rate_cents'] = segment_rates[np.searchsorted(starts, minute - 1, side='right') - 1]
+        rows['earnings_cents'] = (
+            np.array(rates.cumulative)[segment] + (minute - starts[segment]) * segment_rates[segment] + 30
+        ) // 60
+        offset += minutes
+    return timeline[:offset]
+
+def timeline_drift(batch, timeline):
+    # Shifts whose recomputed timeline does not end on the earnings recorded
+    # for them, i.e. they were paid under different rate rules
+    minutes = np.array([row[5] for row in batch])
+    crossed = minutes > 0
+    recorded = np.round(np.array([row[6] for row in batch], dtype=np.float64) * 100)[crossed]
+    last = np.cumsum(minutes[crossed]) - 1
+    return int(np.count_nonzero(timeline['earnings_cents'][last] != recorded))
+
+class CsvExportWriter:
+    def __init__(self, path, dtype):
+        self.file = open(path, 'w', newline='')
+        self.writer = csv.writer(self.file)
+        self.shifts = dtype == SHIFT_DTYPE
+        self.writer.writerow(SHIFT_CSV_FIELDS if self.shifts else dtype.names)
+
+    def write(self, array):
+        if not self.shifts:
+            # Timeline columns are all integers, so each row is one %-format,
+            # which is about twice as fast as csv.writer at millions of rows
+            line = ','.join(['%d'] * len(array.dtype.names)) + self.writer.dialect.lineterminator
+            self.file.write(''.join(map(line.__mod__, zip(*(array[name].tolist() for name in array.dtype.names)))))
+            return
+        self.writer.writerows(
+            (
+                shift_id, datetime.fromtimestamp(start).isoformat(timespec='seconds'),
+                datetime.fromtimestamp(end).isoformat(timespec='seconds'), format_cents(wage), tax_rate, minutes,
+                format_cents(earnings), format_cents(tax), format_cents(after_tax), milestones,
+            )
+            for shift_id, start, end, wage, tax_rate, minutes, earnings, tax, after_tax, milestones in array.tolist()
+        )
+
+    def close(self):
+        self.file.close()
+
+class ArrowExportWriter:
+    def __init__(self, path, dtype):
+        self.names = dtype.names
+        self.schema = pa.schema([(name, pa.from_numpy_dtype(dtype[name])) for name in self.names])
+        self.sink = None
+        if path.lower().endswith('.parquet'):
+            self.writer = pq.ParquetWriter(path, self.schema)
+        else:
+            self.sink = pa.OSFile(path, 'wb')
+            self.writer = pa.ipc.new_file(self.sink, self.schema)
+
+    def write(self, array):
+        columns = [pa.array(np.ascontiguousarray(array[name])) for name in self.names]
+        batch = pa.RecordBatch.from_arrays(columns, schema=self.schema)
+        if self.sink is None:
+            self.writer.write_table(pa.Table.from_batches([batch]))
+        else:
+            self.writer.write_batch(batch)
+
+    def close(self):
+        self.writer.close()
+        if self.sink is not None:
+            self.sink.close()
+
+class NpyExportWriter:
+    # The file is sized from a COUNT query up front and filled through a
+    # memory map, so it is written in place without holding the rows
+    def __init__(self, path, dtype, count):
+        self.array = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=(count,))
+        self.offset = 0
+
+    def write(self, array):
+        end = self.offset + len(array)
+        if end > len(self.array):
+            raise ValueError("history changed while it was being exported")
+        self.array[self.offset:end] = array
+        self.offset = end
+
+    def close(self):
+        self.array.flush()
+        del self.array
+
+def export_path(path):
+    # .parquet/.arrow without pyarrow installed become .npy next to them
+    root, ext = os.path.splitext(path)
+    ext = ext.lower()
+    if ext in ('.parquet', '.arrow') and pa is None:
+        return root + '.npy'
+    if ext != '.csv' and ext not in COLUMNAR_EXTENSIONS:
+        raise ValueError(f"Unknown export format {ext or path!r}, expected .csv or one of {COLUMNAR_EXTENSIONS}")
+    return path
+
+def export_history(history, path, timeline=False, since=None, until=None, rate_schedule=NO_RATE_RULES,
+                   batch_size=EXPORT_BATCH_SIZE):
+    # Writes shifts (or their per-minute timelines) to path and returns
+    # (path actually written, rows written, shifts whose recomputed timeline
+    # disagrees with their recorded earnings)
+    path = export_path(path)
+    dtype = TIMELINE_DTYPE if timeline else SHIFT_DTYPE
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.csv':
+        writer = CsvExportWriter(path, dtype)
+    elif ext == '.npy':
+        writer = NpyExportWriter(path, dtype, count_rows(history, since, until, timeline))
+    else:
+        writer = ArrowExportWriter(path, dtype)
+
+    rows = 0
+    drifted = 0
+    try:
+        for batch in iter_batches(history, since, until, batch_size):
+            if timeline:
+                array = timeline_array(batch, rate_schedule)
+                drifted += timeline_drift(batch, array)
+            else:
+                array = shift_array(batch)
+            writer.write(array)
+            rows += len(array)
+    finally:
+        writer.close()
+    return path, rows, drifted
+
+def drift_warning(drifted):
+    return (
+        f"{drifted} shift timeline{'s' if drifted != 1 else ''} recomputed with these rate rules "
+        "did not match the earnings recorded for the shift"
+    )
+
+def export_name(kind, ext, now=None):
+    return f"{kind}-{(now or datetime.now()).strftime('%Y%m%d-%H%M%S')}{ext}"
+
+def parse_date(value):
+    return datetime.fromisoformat(value)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export shift history and per-minute earnings timelines")
+    parser.add_argument('--history', default=HISTORY_PATH, help="shift history database")
+    parser.add_argument('--shifts', help="write one row per shift to this .csv, .parquet, .arrow or .npy file")
+    parser.add_argument('--timeline', help="write one row per shift minute, recomputed with --rate-rules, to this "
+                                           ".csv, .parquet, .arrow or .npy file")
+    parser.add_argument('--since', type=parse_date, help="only shifts starting at or after this ISO date/time")
+    parser.add_argument('--until', type=parse_date, help="only shifts starting before this ISO date/time")
+    parser.add_argument('--rate-rules', help="JSON overtime and shift differential rules to recompute the timelines with")
+    parser.add_argument('--batch-size', type=int, default=EXPORT_BATCH_SIZE, help="shifts read per batch")
+    args = parser.parse_args(argv)
+    if not args.shifts and not args.timeline:
+        parser.error("nothing to export, pass --shifts and/or --timeline")
+
+    if args.history != ':memory:' and not os.path.exists(args.history):
+        print(f"No shift history at {args.history}", file=sys.stderr)
+        return 1
+    try:
+        rate_schedule = load_rate_schedule(args.rate_rules) if args.rate_rules else NO_RATE_RULES
+        with ShiftHistory(args.history) as history:
+            for path, timeline in ((args.shifts, False), (args.timeline, True)):
+                if not path:
+                    continue
+                written, rows, drifted = export_history(
+                    history, path, timeline, args.since, args.until, rate_schedule, max(1, args.batch_size)
+                )
+                print(f"Wrote {rows} {'minutes' if timeline else 'shifts'} to {written}")
+                if drifted:
+                    print(f"Warning: {drift_warning(drifted)}", file=sys.stderr)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Export failed: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
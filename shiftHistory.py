@@ -0,0 +1,134 @@
+import json
+import os
+import sqlite3
+from collections import namedtuple
+from datetime import datetime
+
+# Completed shifts are kept in an SQLite database in WAL mode. Rows are only
+# ever inserted, so an interrupted write can at worst lose the batch that was
+# in flight, never corrupt earlier shifts.
+DEFAULT_HISTORY_PATH = os.path.join(os.path.expanduser('~'), '.wage_tracker', 'history.db')
+HISTORY_PATH = os.environ.get('WAGE_TRACKER_HISTORY', DEFAULT_HISTORY_PATH)
+BATCH_SIZE = 64
+
+# tax is the amount actually withheld, brackets included; shifts recorded
+# before it was kept have None and fall back to earnings * tax_rate
+ShiftRecord = namedtuple('ShiftRecord', [
+    'start', 'end', 'hourly_wage', 'tax_rate', 'earnings', 'hours', 'milestones', 'tax',
+], defaults=(None,))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS shifts (
+    id INTEGER PRIMARY KEY,
+    start_ts REAL NOT NULL,
+    end_ts REAL NOT NULL,
+    hourly_wage REAL NOT NULL,
+    tax_rate REAL NOT NULL,
+    earnings REAL NOT NULL,
+    hours REAL NOT NULL,
+    milestones TEXT NOT NULL,
+    tax REAL
+);
+CREATE INDEX IF NOT EXISTS shifts_start ON shifts (start_ts);
+"""
+
+COLUMNS = "start_ts, end_ts, hourly_wage, tax_rate, earnings, hours, milestones, tax"
+
+def record_from_engine(engine, end_time, earnings, hours):
+    return ShiftRecord(
+        engine.start_time, end_time, engine.hourly_wage, engine.effective_tax_rate(earnings),
+        earnings, hours, [name for _, name in engine.milestones.unlocked], engine.tax_amount(earnings),
+    )
+
+def record_to_row(record):
+    return (
+        record.start.timestamp(), record.end.timestamp(), record.hourly_wage, record.tax_rate,
+        record.earnings, record.hours, json.dumps(list(record.milestones)), record.tax,
+    )
+
+def row_to_record(row):
+    start_ts, end_ts, hourly_wage, tax_rate, earnings, hours, milestones, tax = row
+    return ShiftRecord(
+        datetime.fromtimestamp(start_ts), datetime.fromtimestamp(end_ts), hourly_wage, tax_rate,
+        earnings, hours, json.loads(milestones), tax,
+    )
+
+class ShiftHistory:
+    def __init__(self, path=HISTORY_PATH, batch_size=BATCH_SIZE):
+        if path != ':memory:':
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.batch_size = batch_size
+        self.pending = []
+        self.listeners = []
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=FULL")
+        self.conn.executescript(SCHEMA)
+        if 'tax' not in {row[1] for row in self.conn.execute("PRAGMA table_info(shifts)")}:
+            # Histories written before the withheld tax was recorded
+            with self.conn:
+                self.conn.execute("ALTER TABLE shifts ADD COLUMN tax REAL")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        self.flush()
+        return self.conn.execute("SELECT COUNT(*) FROM shifts").fetchone()[0]
+
+    def append(self, record):
+        # Buffered until batch_size records are pending; flush() forces a write
+        self.pending.append(record)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        records, self.pending = self.pending, []
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT INTO shifts ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [record_to_row(record) for record in records],
+            )
+        for listener in self.listeners:
+            listener(records)
+
+    def subscribe(self, listener):
+        # listener(records) is called with every batch once it is committed
+        self.listeners.append(listener)
+
+    def iter_rows(self, since=None, until=None, columns=COLUMNS):
+        # Streams raw rows in start order, using the start_ts index for ranges
+        self.flush()
+        query = f"SELECT {columns} FROM shifts"
+        clauses, params = [], []
+        if since is not None:
+            clauses.append("start_ts >= ?")
+            params.append(since.timestamp())
+        if until is not None:
+            clauses.append("start_ts < ?")
+            params.append(until.timestamp())
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY start_ts"
+        return self.conn.execute(query, params)
+
+    def iter_shifts(self, since=None, until=None):
+        for row in self.iter_rows(since, until):
+            yield row_to_record(row)
+
+    def load(self, since=None, until=None):
+        return list(self.iter_shifts(since, until))
+
+    def close(self):
+        if self.conn is None:
+            return
+        self.flush()
+        self.conn.close()
+        self.conn = None
@@ -0,0 +1,180 @@
+from datetime import datetime
+
+import numpy as np
+
+from wageEngine import (
+    MILESTONE_ITEMS, NO_BRACKETS, NO_RATE_RULES, ShiftRates, parse_time, read_rows, to_basis_points, to_cents,
+)
+
+TABLE_CAPACITY = 64
+# Pads the unused rate segments of a row so they are never selected
+SEGMENT_PAD = np.iinfo(np.int64).max
+
+def load_roster(path, now=None):
+    # Accepts a CSV file with name,wage,tax,start rows (tax in percent, start as
+    # HH:MM) or a JSON list of objects with the same keys
+    rows = read_rows(path, 'name', lambda roster: [
+        (row['name'], row['wage'], row['tax'], row['start']) for row in roster
+    ])
+
+    roster = []
+    for name, wage, tax, start in rows:
+        start_time = parse_time(str(start).strip(), now)
+        if start_time is None:
+            raise ValueError(f"Invalid start time for {name}: {start}")
+        roster.append((str(name).strip(), float(wage), float(tax) / 100, start_time))
+    return roster
+
+class ShiftTable:
+    # Many concurrent shifts stored column-wise in NumPy arrays. update() does
+    # the same work as ShiftEngine.calculate_earnings/check_minute_update/
+    # unlock_milestones for every row in one vectorized pass, with the same
+    # integer-cent rounding as EarningsAccumulator.
+    def __init__(self, capacity=TABLE_CAPACITY, milestone_items=None, tax_schedule=NO_BRACKETS,
+                 rate_schedule=NO_RATE_RULES):
+        ordered = sorted(MILESTONE_ITEMS if milestone_items is None else milestone_items, key=lambda item: item[0])
+        self.milestone_cents = np.array([to_cents(price) for price, _ in ordered], dtype=np.int64)
+        self.milestone_names = [name for _, name in ordered]
+        # Shared bracket layers; each row's own rate is withheld on top
+        self.tax_schedule = tax_schedule
+        # Overtime and differentials are compiled per row into the same
+        # segments ShiftRates uses (start minute, rate, accrued units), padded
+        # to the longest row; without rules every row has one segment
+        self.rate_schedule = rate_schedule
+        self.segments = 1
+
+        self.names = []
+        self.count = 0
+        self.capacity = 0
+        self.allocate(capacity)
+
+    def allocate(self, capacity):
+        old_count = self.count
+        columns = (
+            ('wage_cents', np.int64, 0), ('tax_basis_points', np.int64, 0), ('start', np.float64, 0),
+            ('last_minute', np.int64, -1), ('next_milestone', np.intp, 0),
+            ('minutes', np.int64, 0), ('earnings_cents', np.int64, 0),
+        )
+        for name, dtype, fill in columns:
+            column = np.full(capacity, fill, dtype=dtype)
+            if old_count:
+                column[:old_count] = getattr(self, name)[:old_count]
+            setattr(self, name, column)
+        self.allocate_segments(capacity, self.segments)
+        self.capacity = capacity
+
+    def allocate_segments(self, capacity, segments):
+        old_count = self.count
+        for name, fill in (('segment_starts', SEGMENT_PAD), ('segment_rates', 0), ('segment_units', SEGMENT_PAD)):
+            matrix = np.full((capacity, segments), fill, dtype=np.int64)
+            if old_count:
+                old = getattr(self, name)
+                matrix[:old_count, :old.shape[1]] = old[:old_count]
+            setattr(self, name, matrix)
+        self.segments = segments
+
+    def __len__(self):
+        return self.count
+
+    def add(self, name, hourly_wage, tax_rate, start_time):
+        if self.count == self.capacity:
+            self.allocate(self.capacity * 2)
+        row = self.count
+        if self.rate_schedule:
+            rates = self.rate_schedule.compile(hourly_wage, start_time)
+        else:
+            rates = ShiftRates((0,), (to_cents(hourly_wage),))
+        if len(rates) > self.segments:
+            self.allocate_segments(self.capacity, len(rates))
+        self.segment_starts[row] = SEGMENT_PAD
+        self.segment_rates[row] = 0
+        self.segment_units[row] = SEGMENT_PAD
+        self.segment_starts[row, :len(rates)] = rates.starts
+        self.segment_rates[row, :len(rates)] = rates.rates
+        self.segment_units[row, :len(rates)] = rates.cumulative
+        self.names.append(name)
+        self.wage_cents[row] = to_cents(hourly_wage)
+        self.tax_basis_points[row] = to_basis_points(tax_rate)
+        self.start[row] = start_time.timestamp()
+        self.last_minute[row] = -1
+        self.next_milestone[row] = 0
+        self.minutes[row] = 0
+        self.earnings_cents[row] = 0
+        self.count += 1
+        return row
+
+    def remove(self, row):
+        # Later rows shift up by one so the display order stays stable
+        n = self.count
+        for column in (self.wage_cents, self.tax_basis_points, self.start, self.last_minute,
+                       self.next_milestone, self.minutes, self.earnings_cents,
+                       self.segment_starts, self.segment_rates, self.segment_units):
+            column[row:n - 1] = column[row + 1:n]
+        del self.names[row]
+        self.count -= 1
+
+    def update(self, now=None):
+        # Returns (rows that crossed a minute, rows that unlocked a milestone)
+        n = self.count
+        now_ts = (now or datetime.now()).timestamp()
+        minutes = self.minutes[:n]
+        earnings = self.earnings_cents[:n]
+
+        elapsed = np.subtract(now_ts, self.start[:n])
+        np.floor_divide(elapsed, 60, out=elapsed)
+        np.maximum(elapsed, 0, out=elapsed)
+        minutes[:] = elapsed
+        # Completed minutes only, rounded half up to the cent (ShiftRates.earnings_cents)
+        if self.segments == 1:
+            np.multiply(self.wage_cents[:n], minutes, out=earnings)
+        else:
+            rows = np.arange(n)
+            segment = np.count_nonzero(self.segment_starts[:n] <= minutes[:, None], axis=1) - 1
+            earnings[:] = self.segment_units[rows, segment]
+            earnings += (minutes - self.segment_starts[rows, segment]) * self.segment_rates[rows, segment]
+        np.add(earnings, 30, out=earnings)
+        np.floor_divide(earnings, 60, out=earnings)
+
+        last_minute = self.last_minute[:n]
+        ticked = np.flatnonzero(minutes > last_minute)
+        last_minute[ticked] = minutes[ticked]
+
+        next_milestone = self.next_milestone[:n]
+        reached = np.searchsorted(self.milestone_cents, earnings, side='right')
+        unlocked = np.flatnonzero(reached > next_milestone)
+        next_milestone[unlocked] = reached[unlocked]
+        return ticked, unlocked
+
+    def after_tax_cents(self, rows=slice(None)):
+        earnings = self.earnings_cents[:self.count][rows]
+        return earnings - self.tax_schedule.tax_cents_array(earnings, self.tax_basis_points[:self.count][rows])
+
+    def next_milestone_eta(self, rows=slice(None)):
+        # (milestone index, whole minutes until it) per row, as
+        # ShiftEngine.next_milestone_eta works it out; index == number of
+        # milestones once a row has unlocked all of them, and minutes is -1
+        # when the pay rate drops to zero before the milestone is reached
+        indices = self.next_milestone[:self.count][rows]
+        if not len(self.milestone_cents):
+            return indices, np.zeros(len(indices), dtype=np.int64)
+        prices = self.milestone_cents[np.minimum(indices, len(self.milestone_cents) - 1)]
+        starts = self.segment_starts[:self.count][rows]
+        rates = self.segment_rates[:self.count][rows]
+        units = self.segment_units[:self.count][rows]
+
+        # ShiftRates.minutes_to_reach: the segment the target falls in, then
+        # ceil((target - accrued) / rate) minutes into it
+        target = prices * 60 - 30
+        segment = np.maximum(np.count_nonzero(units < target[:, None], axis=1) - 1, 0)
+        picked = np.arange(len(indices))
+        rate = rates[picked, segment]
+        reached = starts[picked, segment] - (units[picked, segment] - target) // np.maximum(rate, 1)
+        reached[target <= 0] = 0
+        remaining = np.maximum(reached - self.minutes[:self.count][rows], 1)
+        remaining[(rate == 0) & (target > 0)] = -1
+        return indices, remaining
+
+    def milestone_name(self, index):
+        if index >= len(self.milestone_names):
+            return None
+        return self.milestone_names[index]
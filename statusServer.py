@@ -0,0 +1,169 @@
+import json
+import os
+import socket
+import socketserver
+import stat
+import sys
+import threading
+from http.client import HTTPConnection
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from wageEngine import format_cents
+
+# Live shift state for other local tools, served as JSON over HTTP on a Unix
+# domain socket or a localhost port. The render loop publishes a snapshot when
+# the shift moves to a new minute; the serializer runs then, and requests
+# only read the latest pre-encoded body, so polling never touches the engine.
+STATUS_ADDRESS = os.environ.get('WAGE_TRACKER_STATUS')
+STATUS_HOST = '127.0.0.1'
+STATUS_PATHS = ('/', '/status')
+STATUS_BACKLOG = 128  # Pending connections, so bursts of pollers are queued rather than refused
+
+def parse_address(address):
+    # 'host:port' or a bare port is TCP, anything else is a Unix socket path
+    host, _, port = str(address).rpartition(':')
+    if port.isdigit():
+        return host or STATUS_HOST, int(port)
+    return str(address)
+
+def idle_snapshot(now):
+    return {'tracking': False, 'updated': now.isoformat(timespec='seconds')}
+
+def snapshot_from_engine(engine, now):
+    totals = engine.earnings
+    snapshot = {
+        'tracking': True,
+        'updated': now.isoformat(timespec='seconds'),
+        'start': engine.start_time.isoformat(timespec='seconds'),
+        'minutes': engine.last_update_minute,
+        'earnings': totals.cents / 100,
+        'tax': totals.tax_cents / 100,
+        'after_tax': totals.after_tax_cents / 100,
+        'earnings_text': format_cents(totals.cents),
+        'hourly_rate': engine.hourly_rate(),
+        'milestones': [name for _, name in engine.milestones.unlocked],
+        'next_milestone': None,
+    }
+    eta = engine.next_milestone_eta()
+    if eta is not None:
+        snapshot['next_milestone'] = {'name': eta[0], 'minutes': eta[1]}
+    return snapshot
+
+class StatusHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive, so pollers reuse one connection
+    server_version = 'WageTracker'
+
+    def do_GET(self):
+        if self.path.split('?', 1)[0] not in STATUS_PATHS:
+            self.send_error(404)
+            return
+        body, etag = self.server.status.current
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self):
+        # Unix socket peers have no address
+        return self.client_address[0] if self.client_address else 'local'
+
+    def log_message(self, format, *args):
+        pass
+
+class TCPStatusServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = STATUS_BACKLOG
+
+if hasattr(socketserver, 'UnixStreamServer'):
+    class UnixStatusServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+        request_queue_size = STATUS_BACKLOG
+else:
+    UnixStatusServer = None
+
+class StatusServer:
+    def __init__(self, address=STATUS_ADDRESS):
+        self.address = parse_address(address)
+        self.version = 0
+        self.current = (b'{}', '"0"')
+        self.server = None
+        self.thread = None
+
+    def publish(self, snapshot):
+        # Called from the render loop; swapping the tuple is atomic, so the
+        # request threads need no lock
+        self.version += 1
+        body = json.dumps(snapshot).encode()
+        self.current = (body, f'"{self.version}"')
+
+    def start(self):
+        if isinstance(self.address, tuple):
+            self.server = TCPStatusServer(self.address, StatusHandler)
+            self.address = self.server.server_address[:2]
+        else:
+            if UnixStatusServer is None:
+                raise OSError("Unix sockets are not supported here, use host:port")
+            if os.path.exists(self.address) and stat.S_ISSOCK(os.stat(self.address).st_mode):
+                # A socket file left behind by a tracker that did not exit cleanly
+                os.unlink(self.address)
+            self.server = UnixStatusServer(self.address, StatusHandler)
+        self.server.status = self
+        self.thread = threading.Thread(target=self.server.serve_forever, name='status-server', daemon=True)
+        self.thread.start()
+        return self.address
+
+    def close(self):
+        if self.server is None:
+            return
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        self.server = None
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+
+class UnixHTTPConnection(HTTPConnection):
+    def __init__(self, path, timeout=5):
+        super().__init__('localhost', timeout=timeout)
+        self.path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.path)
+
+def read_status(address=STATUS_ADDRESS, timeout=5):
+    address = parse_address(address)
+    if isinstance(address, tuple):
+        conn = HTTPConnection(*address, timeout=timeout)
+    else:
+        conn = UnixHTTPConnection(address, timeout)
+    try:
+        conn.request('GET', '/status')
+        response = conn.getresponse()
+        if response.status != 200:
+            raise OSError(f"status endpoint answered {response.status} {response.reason}")
+        return json.loads(response.read())
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    # `python statusServer.py [address]` prints the running tracker's state
+    address = sys.argv[1] if len(sys.argv) > 1 else STATUS_ADDRESS
+    if not address:
+        print("Pass the status address or set WAGE_TRACKER_STATUS")
+        sys.exit(1)
+    try:
+        print(json.dumps(read_status(address), indent=2))
+    except (OSError, ValueError) as e:
+        print(f"Could not read status from {address}: {e}")
+        sys.exit(1)
@@ -0,0 +1,24 @@
+from decimal import ROUND_HALF_UP, Decimal
+
+import pytest
+
+from wageEngine import NO_BRACKETS, ShiftRates, minute_earnings_cents
+
+# The tracker, ShiftTable and the payroll CLI all promise the same whole cents
+# for the same shift; these pin the shared rules down without pygame.
+
+def half_up(value):
+    return int(Decimal(value).quantize(Decimal(1), ROUND_HALF_UP))
+
+@pytest.mark.parametrize('wage_cents', [1, 1501, 1999, 2000, 3333, 123457])
+def test_minute_earnings_round_half_up_once(wage_cents):
+    for minutes in range(0, 2000, 7):
+        assert minute_earnings_cents(wage_cents, minutes) == half_up(Decimal(wage_cents * minutes) / 60)
+
+def test_single_rate_matches_minute_earnings():
+    rates = ShiftRates((0,), (1501,))
+    assert [rates.earnings_cents(m) for m in range(600)] == [minute_earnings_cents(1501, m) for m in range(600)]
+
+def test_flat_tax_without_brackets():
+    assert NO_BRACKETS.tax_cents(10000, 2500) == 2500
+    assert NO_BRACKETS.tax_cents(8450, 2500) == 2113  # 2112.5 rounds up
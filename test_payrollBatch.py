@@ -0,0 +1,59 @@
+import io
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+from payrollBatch import pay_shift, read_shifts, run_batch
+from wageEngine import RateSchedule, ShiftEngine, minute_earnings_cents
+
+MONDAY = datetime(2026, 1, 5, 9, 0)
+
+SHIFTS_CSV = """worker,clock_in,clock_out,wage,tax_rate
+ana,2026-01-05T09:00:00,2026-01-05T17:30:59,15.01,0.1
+ben,2026-01-05T22:00:00,2026-01-06T06:00:00,19.99,0.25
+cy,2026-01-05T09:00:00,2026-01-05T08:00:00,20,0.1
+"""
+
+def test_pay_shift_rows(tmp_path):
+    path = tmp_path / 'shifts.csv'
+    path.write_text(SHIFTS_CSV)
+    rows = list(read_shifts(str(path)))
+    assert [row[:2] for row in rows] == [(2, 'ana'), (3, 'ben'), (4, 'cy')]
+
+    _, _, minutes, earnings, tax = pay_shift(*rows[0][2:])
+    assert (minutes, earnings, tax) == (510, minute_earnings_cents(1501, 510), 1276)
+    _, _, minutes, earnings, tax = pay_shift(*rows[1][2:])
+    assert (minutes, earnings, tax) == (480, 15992, 3998)
+    with pytest.raises(ValueError):
+        pay_shift(*rows[2][2:])
+
+def test_pay_shift_matches_engine():
+    schedule = RateSchedule([(480, 1.5)])
+    start, end = MONDAY, MONDAY + timedelta(hours=10, minutes=3)
+    _, _, minutes, earnings, _ = pay_shift(start.isoformat(), end.isoformat(), '21.37', '0.2', rate_schedule=schedule)
+    engine = ShiftEngine(21.37, 0.2, start, rate_schedule=schedule)
+    engine.calculate_earnings(end)
+    assert (minutes, earnings) == (603, engine.earnings.cents)
+
+def test_run_batch_totals(tmp_path):
+    path = tmp_path / 'shifts.csv'
+    path.write_text(SHIFTS_CSV)
+    output = io.StringIO()
+    summary = run_batch(str(path), output)
+    assert summary['shifts'] == 2
+    assert summary['rejected'] == 1
+    assert summary['earnings'] == (minute_earnings_cents(1501, 510) + 15992) / 100
+    assert len(output.getvalue().splitlines()) == 3
+
+def test_tracker_subcommand_prints_only_json(tmp_path):
+    path = tmp_path / 'shifts.csv'
+    path.write_text(SHIFTS_CSV)
+    tracker = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'wageTracker.py')
+    result = subprocess.run(
+        [sys.executable, tracker, 'payroll', str(path)], capture_output=True, text=True, check=True,
+    )
+    assert json.loads(result.stdout)['shifts'] == 2
@@ -0,0 +1,61 @@
+import json
+from datetime import datetime, timedelta
+
+from wageEngine import RateSchedule, ShiftEngine, ShiftRates, load_rate_schedule
+
+MONDAY = datetime(2026, 1, 5, 9, 0)
+
+def reference_earnings(schedule, wage_cents, start, minutes):
+    # Minute by minute, paying each minute at the rate in force when it began
+    units = sum(
+        schedule.rate_cents(wage_cents, m, start + timedelta(minutes=m)) for m in range(minutes)
+    )
+    return (units + 30) // 60
+
+def test_overtime_segments():
+    rates = RateSchedule([(480, 1.5), (720, 2)]).compile(20, MONDAY)
+    assert (rates.starts, rates.rates) == ([0, 480, 720], [2000, 3000, 4000])
+    assert rates.earnings_cents(480) == 16000
+    assert rates.earnings_cents(481) == 16050
+    assert rates.earnings_cents(721) == 16000 + 12000 + 67
+
+def test_night_and_weekend_differentials(tmp_path):
+    path = tmp_path / 'rates.json'
+    path.write_text(json.dumps({
+        'overtime': [{'after_hours': 8, 'multiplier': 1.5}],
+        'differentials': [
+            {'name': 'night', 'start': '22:00', 'end': '06:00', 'premium': 2.0},
+            {'name': 'weekend', 'days': ['sat', 'sun'], 'multiplier': 1.25},
+        ],
+    }))
+    schedule = load_rate_schedule(str(path))
+    # Friday evening into Saturday morning crosses night, overtime and the weekend
+    start = datetime(2026, 1, 9, 17, 13)
+    rates = schedule.compile(17.35, start, 16 * 60)
+    for minutes in range(0, 16 * 60, 11):
+        assert rates.earnings_cents(minutes) == reference_earnings(schedule, 1735, start, minutes)
+
+def test_minutes_to_reach():
+    rates = RateSchedule([(480, 2)]).compile(15.01, MONDAY)
+    for cents in (1, 25, 500, 12007, 12008, 12010, 20000):
+        minutes = rates.minutes_to_reach(cents)
+        assert rates.earnings_cents(minutes) >= cents
+        assert minutes == 0 or rates.earnings_cents(minutes - 1) < cents
+    assert ShiftRates((0,), (0,)).minutes_to_reach(100) is None
+
+def test_minute_increments_add_up_to_the_total():
+    engine = ShiftEngine(20, 0, MONDAY, rate_schedule=RateSchedule([(480, 2)]))
+    total = 0
+    increments = {}
+    for minute in range(0, 600):
+        increment = engine.check_minute_update(MONDAY + timedelta(minutes=minute, seconds=30))
+        increments[minute] = increment
+        total += increment
+        assert total == engine.rates.earnings_cents(minute)
+    assert (increments[480], increments[481]) == (33, 67)
+
+def test_next_milestone_eta_follows_rate_changes():
+    engine = ShiftEngine(20, 0, MONDAY, milestone_items=[(170, 'a bike')], rate_schedule=RateSchedule([(480, 2)]))
+    engine.calculate_earnings(MONDAY + timedelta(minutes=470))
+    # $156.67 by 470 minutes, then $0.67 a minute on overtime
+    assert engine.next_milestone_eta() == ('a bike', 25)
@@ -0,0 +1,37 @@
+from datetime import datetime, timedelta
+
+from shiftAnalytics import ShiftAnalytics
+from shiftHistory import ShiftHistory, ShiftRecord
+
+MONDAY = datetime(2026, 1, 5, 9, 0)
+
+def sample_records():
+    # Effective tax rates as record_from_engine stores them: tax cents / earnings cents
+    return [
+        ShiftRecord(MONDAY + timedelta(days=day), MONDAY + timedelta(days=day, hours=8), 15.01, tax / earnings,
+                    earnings / 100, 8.0, ['a coffee'] * (day % 3))
+        for day, (earnings, tax) in enumerate([(12008, 1201), (8450, 2113), (123457, 30864), (1, 0), (99999, 1)])
+    ]
+
+def test_after_tax_totals_are_exact_cents():
+    records = sample_records()
+    analytics = ShiftAnalytics([], [], [[]] * 4)
+    analytics.append(records)
+    summary = analytics.summary()
+    assert summary['earnings_cents'] == 12008 + 8450 + 123457 + 1 + 99999
+    assert summary['tax_cents'] == 1201 + 2113 + 30864 + 0 + 1
+    assert summary['milestones'] == 0 + 1 + 2 + 0 + 1
+
+def test_loaded_and_appended_totals_agree():
+    records = sample_records()
+    appended = ShiftAnalytics([], [], [[]] * 4)
+    appended.append(records)
+    with ShiftHistory(':memory:') as history:
+        for record in records:
+            history.append(record)
+        loaded = ShiftAnalytics.from_history(history)
+    assert loaded.summary() == appended.summary()
+    for period in ('weekly', 'monthly'):
+        ours, theirs = getattr(loaded, period), getattr(appended, period)
+        assert ours.keys.tolist() == theirs.keys.tolist()
+        assert [column.tolist() for column in ours.values] == [column.tolist() for column in theirs.values]
@@ -0,0 +1,71 @@
+import threading
+from datetime import datetime, timedelta
+
+from shiftCheckpoint import RECORD, ShiftCheckpoint, is_stale
+from wageEngine import ShiftEngine
+
+MONDAY = datetime(2026, 1, 5, 9, 0)
+
+def test_checkpoint_round_trip(tmp_path):
+    engine = ShiftEngine(18.75, 0.2, MONDAY)
+    engine.check_minute_update(MONDAY + timedelta(minutes=95))
+    engine.unlock_milestones(engine.calculate_earnings(MONDAY + timedelta(minutes=95))[0])
+
+    checkpoint = ShiftCheckpoint(str(tmp_path / 'checkpoint.bin'))
+    try:
+        checkpoint.save(engine, MONDAY + timedelta(minutes=95, seconds=10))
+        state = checkpoint.load()
+        assert state == {
+            'start_time': MONDAY, 'hourly_wage': 18.75, 'tax_rate': 0.2, 'last_update_minute': 95,
+            'unlocked': engine.milestones.next_index, 'saved_at': MONDAY + timedelta(minutes=95, seconds=10),
+        }
+        checkpoint.clear()
+        assert checkpoint.load() is None
+    finally:
+        checkpoint.close()
+
+def test_checkpoint_rejects_bad_checksum(tmp_path):
+    path = tmp_path / 'checkpoint.bin'
+    checkpoint = ShiftCheckpoint(str(path))
+    try:
+        checkpoint.save(ShiftEngine(18.75, 0.2, MONDAY), MONDAY)
+        assert checkpoint.load() is not None
+        # Flip one byte of the tax rate inside the record
+        checkpoint.mm[RECORD.size - 30] ^= 0xFF
+        assert checkpoint.load() is None
+    finally:
+        checkpoint.close()
+
+    reopened = ShiftCheckpoint(str(path))
+    try:
+        assert reopened.load() is None
+    finally:
+        reopened.close()
+
+def test_stale_checkpoints_are_not_resumed():
+    state = {'saved_at': MONDAY}
+    assert not is_stale(state, MONDAY + timedelta(hours=11))
+    assert is_stale(state, MONDAY + timedelta(days=3))
+    assert not is_stale(state, MONDAY + timedelta(days=3), max_age=timedelta(days=7))
+
+def test_write_during_flush_queues_another(tmp_path):
+    checkpoint = ShiftCheckpoint(str(tmp_path / 'checkpoint.bin'))
+    flushing = threading.Event()
+    release = threading.Event()
+    flushes = []
+
+    def sync():
+        flushes.append(checkpoint.load())
+        flushing.set()
+        release.wait(5)
+
+    checkpoint.sync = sync
+    try:
+        checkpoint.save(ShiftEngine(18.75, 0.2, MONDAY), MONDAY)
+        assert flushing.wait(5)
+        # The last state before a crash lands while the first flush is still running
+        checkpoint.save(ShiftEngine(18.75, 0.2, MONDAY), MONDAY + timedelta(minutes=1))
+        release.set()
+    finally:
+        checkpoint.close()
+    assert [state['saved_at'] for state in flushes] == [MONDAY, MONDAY + timedelta(minutes=1)]
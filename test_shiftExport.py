@@ -0,0 +1,71 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from shiftAnalytics import ShiftAnalytics
+from shiftExport import export_history, timeline_array
+from shiftHistory import ShiftHistory, ShiftRecord
+from wageEngine import RateSchedule, ShiftEngine
+
+MONDAY = datetime(2026, 1, 5, 9, 0)
+
+def test_export_timeline_matches_increments():
+    schedule = RateSchedule([(480, 2)])
+    start = MONDAY.timestamp()
+    # (id, start, end, wage, tax rate, minutes, earnings, milestones, tax cents) as exported
+    timeline = timeline_array([(7, start, start + 600 * 60, 20.0, 0.1, 600, 0, 0, None)], schedule)
+    engine = ShiftEngine(20, 0.1, MONDAY, rate_schedule=schedule)
+    engine.check_minute_update(MONDAY)
+    increments = [engine.check_minute_update(MONDAY + timedelta(minutes=m)) for m in range(1, 601)]
+    assert timeline['earnings_cents'].tolist() == [engine.rates.earnings_cents(m) for m in range(1, 601)]
+    assert np.diff(timeline['earnings_cents'], prepend=0).tolist() == increments
+    assert timeline['rate_cents'][479:481].tolist() == [2000, 4000]
+
+def test_recorded_tax_is_exported_and_summed(tmp_path):
+    # Bracketed tax is not earnings * tax_rate, so it has to come from the record
+    records = [
+        ShiftRecord(MONDAY, MONDAY + timedelta(hours=8), 12.5, 0.1, 100.0, 8.0, [], 12.34),
+        ShiftRecord(MONDAY + timedelta(days=1), MONDAY + timedelta(days=1, hours=8), 12.5, 0.25, 84.5, 8.0, []),
+    ]
+    with ShiftHistory(':memory:') as history:
+        for record in records:
+            history.append(record)
+        path, rows, drifted = export_history(history, str(tmp_path / 'shifts.npy'))
+        summary = ShiftAnalytics.from_history(history).summary()
+    shifts = np.load(path)
+    assert (rows, drifted) == (2, 0)
+    # 2112.5 cents rounds up for the shift saved before tax was recorded
+    assert shifts['tax_cents'].tolist() == [1234, 2113]
+    assert shifts['after_tax_cents'].tolist() == [8766, 6337]
+    assert summary['tax_cents'] == 1234 + 2113
+
+def test_timelines_recomputed_under_other_rules_are_counted(tmp_path):
+    # Paid at a flat $20/hour for ten hours, exported with overtime rules
+    record = ShiftRecord(MONDAY, MONDAY + timedelta(hours=10), 20.0, 0.1, 200.0, 10.0, [], 20.0)
+    with ShiftHistory(':memory:') as history:
+        history.append(record)
+        assert export_history(history, str(tmp_path / 'flat.npy'), timeline=True)[1:] == (600, 0)
+        overtime = export_history(history, str(tmp_path / 'overtime.npy'), timeline=True,
+                                  rate_schedule=RateSchedule([(480, 1.5)]))
+    assert overtime[1:] == (600, 1)
+
+def test_histories_without_tax_are_upgraded(tmp_path):
+    path = str(tmp_path / 'history.db')
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE shifts (id INTEGER PRIMARY KEY, start_ts REAL NOT NULL, end_ts REAL NOT NULL, "
+        "hourly_wage REAL NOT NULL, tax_rate REAL NOT NULL, earnings REAL NOT NULL, hours REAL NOT NULL, "
+        "milestones TEXT NOT NULL)"
+    )
+    conn.execute(
+        "INSERT INTO shifts (start_ts, end_ts, hourly_wage, tax_rate, earnings, hours, milestones) "
+        "VALUES (?, ?, 20.0, 0.1, 160.0, 8.0, '[]')",
+        (MONDAY.timestamp(), (MONDAY + timedelta(hours=8)).timestamp()),
+    )
+    conn.commit()
+    conn.close()
+    with ShiftHistory(path) as history:
+        history.append(ShiftRecord(MONDAY + timedelta(days=1), MONDAY + timedelta(days=1, hours=8),
+                                   20.0, 0.1, 160.0, 8.0, [], 16.0))
+        assert [record.tax for record in history.load()] == [None, 16.0]
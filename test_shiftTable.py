@@ -0,0 +1,79 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from shiftTable import ShiftTable, load_roster
+from wageEngine import RateSchedule, ShiftEngine, TaxSchedule
+
+MONDAY = datetime(2026, 1, 5, 9, 0)
+
+def test_shift_table_matches_engine():
+    now = MONDAY + timedelta(hours=9, minutes=17, seconds=42)
+    schedule = TaxSchedule([('federal', [(0, 1000), (15000, 2200)])])
+    shifts = [
+        (15.01, 0.1, MONDAY), (19.99, 0.25, MONDAY + timedelta(minutes=13)),
+        (72.5, 0.0, MONDAY + timedelta(hours=6, seconds=59)), (33.33, 0.3333, now - timedelta(seconds=59)),
+    ]
+    table = ShiftTable(capacity=2, tax_schedule=schedule)
+    for i, (wage, tax_rate, start) in enumerate(shifts):
+        table.add(f"worker {i}", wage, tax_rate, start)
+    table.update(now)
+
+    after_tax = table.after_tax_cents().tolist()
+    for row, (wage, tax_rate, start) in enumerate(shifts):
+        engine = ShiftEngine(wage, tax_rate, start, tax_schedule=schedule)
+        earnings, _ = engine.calculate_earnings(now)
+        engine.unlock_milestones(earnings)
+        assert table.earnings_cents[row] == engine.earnings.cents
+        assert after_tax[row] == engine.earnings.after_tax_cents
+        assert table.next_milestone[row] == engine.milestones.next_index
+        index, minutes = table.next_milestone_eta(slice(row, row + 1))
+        assert (table.milestone_name(int(index[0])), int(minutes[0])) == engine.next_milestone_eta()
+
+@pytest.mark.parametrize('wage', [19.99, 15.01, 33.33, 7.25])
+def test_eta_matches_engine_every_minute(wage):
+    table = ShiftTable(capacity=1)
+    table.add("worker", wage, 0.2, MONDAY)
+    engine = ShiftEngine(wage, 0.2, MONDAY)
+    for minute in range(0, 3000, 7):
+        now = MONDAY + timedelta(minutes=minute, seconds=15)
+        table.update(now)
+        earnings, _ = engine.calculate_earnings(now)
+        engine.unlock_milestones(earnings)
+        index, minutes = table.next_milestone_eta()
+        name = table.milestone_name(int(index[0]))
+        expected = engine.next_milestone_eta()
+        assert (None if name is None else (name, int(minutes[0]))) == expected
+
+def test_rate_rules_match_engine():
+    schedule = RateSchedule([(480, 1.5), (600, 2)])
+    now = MONDAY + timedelta(hours=11, minutes=3)
+    shifts = [(20, 0.1, MONDAY), (17.35, 0.25, MONDAY + timedelta(hours=3)), (31, 0.2, now - timedelta(minutes=2))]
+    table = ShiftTable(capacity=1, rate_schedule=schedule)
+    for i, (wage, tax_rate, start) in enumerate(shifts):
+        table.add(f"worker {i}", wage, tax_rate, start)
+    table.remove(1)
+    del shifts[1]
+    table.update(now)
+
+    indices, etas = table.next_milestone_eta()
+    for row, (wage, tax_rate, start) in enumerate(shifts):
+        engine = ShiftEngine(wage, tax_rate, start, rate_schedule=schedule)
+        earnings, _ = engine.calculate_earnings(now)
+        engine.unlock_milestones(earnings)
+        assert table.earnings_cents[row] == engine.earnings.cents
+        assert (table.milestone_name(int(indices[row])), int(etas[row])) == engine.next_milestone_eta()
+
+def test_roster_csv_and_json_agree(tmp_path):
+    csv_path = tmp_path / 'roster.csv'
+    csv_path.write_text("# day crew\nname,wage,tax,start\nana,15.01,10,09:00\n\nben,19.99,25,13:30\n")
+    json_path = tmp_path / 'roster.json'
+    json_path.write_text(json.dumps([
+        {'name': 'ana', 'wage': 15.01, 'tax': 10, 'start': '09:00'},
+        {'name': 'ben', 'wage': '19.99', 'tax': '25', 'start': '13:30'},
+    ]))
+    now = MONDAY.replace(hour=18)
+    roster = load_roster(str(csv_path), now)
+    assert roster == load_roster(str(json_path), now)
+    assert roster == [('ana', 15.01, 0.1, MONDAY), ('ben', 19.99, 0.25, MONDAY.replace(hour=13, minute=30))]
@@ -0,0 +1,48 @@
+import json
+
+import numpy as np
+
+from wageEngine import TaxSchedule, load_tax_schedule
+
+def test_bracket_layers_add_up():
+    schedule = TaxSchedule([
+        ('federal', [(0, 1000), (10000, 2000)]),
+        ('state', [(0, 500)]),
+    ])
+    assert schedule.tax_cents(5000) == 750
+    # 10% + 5% of the first $100, 20% + 5% of the next $50
+    assert schedule.tax_cents(15000) == 1500 + 1250
+    assert schedule.tax_cents(15000, 1000) == 1500 + 1250 + 1500
+
+def test_tax_array_matches_scalar():
+    schedule = TaxSchedule([('federal', [(0, 1000), (4433, 1200), (20000, 2200)]), ('fica', [(0, 765)])])
+    earnings = np.arange(0, 50000, 37, dtype=np.int64)
+    flat = (earnings % 3) * 250
+    expected = [schedule.tax_cents(int(e), int(f)) for e, f in zip(earnings, flat)]
+    assert schedule.tax_cents_array(earnings, flat).tolist() == expected
+
+def test_unnamed_json_layers_are_not_merged(tmp_path):
+    path = tmp_path / 'brackets.json'
+    path.write_text(json.dumps({'layers': [{'brackets': [[0, 10], [100, 20]]}, {'brackets': [[0, 5]]}]}))
+    assert load_tax_schedule(str(path)).tax_cents(10000) == 1500
+
+def test_csv_layers_are_grouped_by_name(tmp_path):
+    path = tmp_path / 'brackets.csv'
+    path.write_text("layer,over,rate\nfederal,0,10\nfederal,100,20\nstate,0,5\n")
+    assert load_tax_schedule(str(path)).tax_cents(15000) == 1500 + 1250
+
+def test_json_periods_per_year(tmp_path):
+    path = tmp_path / 'brackets.json'
+    path.write_text(json.dumps({
+        'periods_per_year': 26,
+        'layers': [{'name': 'federal', 'brackets': [{'over': 0, 'rate': 10}, {'over': 2600, 'rate': 20}]}],
+    }))
+    # $100 a period before the 20% bracket
+    assert load_tax_schedule(str(path)).tax_cents(15000) == 1000 + 1000
+
+def test_csv_comments_and_header_are_skipped(tmp_path):
+    path = tmp_path / 'brackets.csv'
+    path.write_text("# federal first\nlayer,over,rate\n\nfederal,0,10\n# then state\n state ,0,5\n")
+    schedule = load_tax_schedule(str(path))
+    assert [name for name, _ in schedule.layers] == ['federal', 'state']
+    assert schedule.tax_cents(10000) == 1500
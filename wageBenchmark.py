@@ -0,0 +1,260 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+# Render offscreen so the benchmark runs on machines without a display
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+
+import wageTracker
+from frameProfiler import percentile
+
+SHIFT_MINUTES = 8 * 60
+SHIFT_START = datetime(2026, 1, 5, 9, 0)
+
+class VirtualClock:
+    # Stands in for datetime.now() and pygame.time.get_ticks() so a shift can be
+    # fast-forwarded frame by frame
+    def __init__(self, start=SHIFT_START):
+        self.start = start
+        self.current = start
+
+    def now(self):
+        return self.current
+
+    def ticks(self):
+        return int((self.current - self.start).total_seconds() * 1000)
+
+    def advance(self, ms):
+        self.current += timedelta(milliseconds=ms)
+
+    def jump_to(self, moment):
+        self.current = max(self.current, moment)
+
+def gc_collections():
+    return sum(stats['collections'] for stats in gc.get_stats())
+
+def measure(frames, step, track_allocations=False):
+    # Calls step(i) for each frame and returns frame time statistics in ms
+    gc.collect()
+    collections_before = gc_collections()
+    blocks_before = sys.getallocatedblocks()
+    if track_allocations:
+        tracemalloc.start()
+
+    frame_times = []
+    started = time.perf_counter()
+    for i in range(frames):
+        frame_start = time.perf_counter()
+        step(i)
+        frame_times.append((time.perf_counter() - frame_start) * 1000)
+    total = time.perf_counter() - started
+
+    result = {}
+    if track_allocations:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result['alloc_peak_kib'] = round(peak / 1024, 1)
+
+    frame_times.sort()
+    result.update({
+        'frames': frames,
+        'mean_ms': round(sum(frame_times) / max(1, frames), 4),
+        'p50_ms': round(percentile(frame_times, 0.50), 4),
+        'p90_ms': round(percentile(frame_times, 0.90), 4),
+        'p99_ms': round(percentile(frame_times, 0.99), 4),
+        'max_ms': round(frame_times[-1] if frame_times else 0.0, 4),
+        'fps': round(frames / total, 1) if total else 0.0,
+        'gc_collections': gc_collections() - collections_before,
+        'net_allocated_blocks': sys.getallocatedblocks() - blocks_before,
+    })
+    return result
+
+def make_tracker(vclock, wage, tax, frame_mode='fixed'):
+    wageTracker.tick_source = vclock.ticks
+    tracker = wageTracker.WageTracker(frame_mode=frame_mode, clock=vclock.now, history_path=None,
+                                      checkpoint_path=None)
+    tracker.wage_input.text = str(wage)
+    tracker.tax_input.text = str(tax)
+    tracker.time_input.text = vclock.now().strftime("%H:%M")
+    return tracker
+
+def bench_setup(args):
+    vclock = VirtualClock()
+    tracker = make_tracker(vclock, args.wage, args.tax)
+    tracker.wage_input.active = True
+    tracker.wage_input.text = ''
+
+    def step(i):
+        # Type into the wage box every few frames like a user would
+        if i % 10 == 0:
+            if len(tracker.wage_input.text) >= 9:
+                event = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_BACKSPACE, unicode='')
+            else:
+                event = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_1, unicode='1')
+            tracker.handle_event(event)
+        tracker.draw_frame()
+        vclock.advance(1000 / wageTracker.FPS)
+
+    return measure(args.frames, step, args.allocations)
+
+def bench_tracking(args):
+    vclock = VirtualClock()
+    tracker = make_tracker(vclock, args.wage, args.tax)
+    tracker.handle_clock_in()
+    # Take the clock-in minute update on the engine directly, so the first
+    # frame does not open with the clock-in celebration and this measures
+    # steady-state frames
+    vclock.advance(5000)
+    tracker.engine.check_minute_update()
+
+    def step(i):
+        tracker.draw_frame()
+        vclock.advance(1000 / wageTracker.FPS)
+
+    return measure(args.frames, step, args.allocations)
+
+def bench_shift(args):
+    # Fast-forward a whole shift: jump to every minute boundary and render the
+    # celebration frames that follow it
+    vclock = VirtualClock()
+    tracker = make_tracker(vclock, args.wage, args.tax)
+    tracker.handle_clock_in()
+    frames_per_minute = args.frames_per_minute
+    celebrations = [0]
+
+    def step(i):
+        minute, frame = divmod(i, frames_per_minute)
+        if frame == 0:
+            vclock.jump_to(SHIFT_START + timedelta(minutes=minute))
+            celebrations[0] += 1
+        tracker.draw_frame()
+        vclock.advance(1000 / wageTracker.FPS)
+
+    result = measure(args.shift_minutes * frames_per_minute, step, args.allocations)
+    earnings, hours = tracker.calculate_earnings()
+    result.update({
+        'shift_minutes': args.shift_minutes,
+        'minute_celebrations': celebrations[0],
+        'milestones_unlocked': len(tracker.engine.milestones.unlocked),
+        'earnings': round(earnings, 2),
+    })
+    return result, tracker, vclock
+
+def bench_summary(args, tracker, vclock):
+    tracker.handle_clock_out()
+
+    def step(i):
+        tracker.draw_frame()
+        vclock.advance(1000 / wageTracker.FPS)
+
+    return measure(args.frames, step, args.allocations)
+
+def bench_floor(args):
+    # Supervisor grid with args.floor_rows concurrent shifts, scrolling steadily
+    from multiTracker import MultiTracker, demo_roster
+    from shiftTable import ShiftTable
+
+    vclock = VirtualClock()
+    wageTracker.tick_source = vclock.ticks
+    random.seed(0)
+    roster = demo_roster(args.floor_rows, vclock.now())
+    table = ShiftTable(capacity=len(roster))
+    for name, wage, tax_rate, start_time in roster:
+        table.add(name, wage, tax_rate, start_time)
+    floor = MultiTracker(table, clock=vclock.now)
+
+    def step(i):
+        floor.scroll_by(3 if (i // 300) % 2 == 0 else -3)
+        floor.update()
+        floor.draw(wageTracker.screen)
+        vclock.advance(1000 / wageTracker.FPS)
+
+    result = measure(args.frames, step, args.allocations)
+    result['rows'] = args.floor_rows
+    return result
+
+def compare(results, baseline, threshold):
+    # Returns human readable lines for every screen whose p50 or p99 got slower
+    # than baseline by more than the threshold ratio
+    regressions = []
+    for screen_name, current in results['screens'].items():
+        previous = baseline.get('screens', {}).get(screen_name)
+        if not previous:
+            continue
+        for key in ('p50_ms', 'p99_ms'):
+            if previous.get(key) and current[key] > previous[key] * threshold:
+                regressions.append(
+                    f"{screen_name} {key}: {previous[key]:.3f} -> {current[key]:.3f} ms"
+                )
+    return regressions
+
+def run_benchmarks(args):
+    wageTracker.init_display()
+
+    results = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'platform': platform.platform(),
+            'video_driver': os.environ.get('SDL_VIDEODRIVER'),
+            'particle_backend': wageTracker.PARTICLE_BACKEND,
+            'wage': args.wage,
+            'tax': args.tax,
+        },
+        'screens': {},
+    }
+    screens = results['screens']
+    screens['setup'] = bench_setup(args)
+    screens['tracking'] = bench_tracking(args)
+    screens['shift'], tracker, vclock = bench_shift(args)
+    screens['summary'] = bench_summary(args, tracker, vclock)
+    if args.floor_rows:
+        if wageTracker.np is None:
+            print("Skipping the floor benchmark: NumPy is not installed", file=sys.stderr)
+        else:
+            screens['floor'] = bench_floor(args)
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless frame-time benchmark for the wage tracker")
+    parser.add_argument('--frames', type=int, default=600, help="frames per static/steady-state screen")
+    parser.add_argument('--shift-minutes', type=int, default=SHIFT_MINUTES, help="minutes of shift to fast-forward")
+    parser.add_argument('--frames-per-minute', type=int, default=60, help="frames rendered after each minute boundary")
+    parser.add_argument('--wage', type=float, default=150.0, help="hourly wage (high enough to unlock every milestone)")
+    parser.add_argument('--tax', type=float, default=25.0, help="tax rate in percent")
+    parser.add_argument('--floor-rows', type=int, default=500, help="concurrent shifts in the floor grid (0 to skip)")
+    parser.add_argument('--allocations', action='store_true', help="track peak allocations with tracemalloc (slower)")
+    parser.add_argument('--output', help="write JSON results to this file instead of stdout")
+    parser.add_argument('--baseline', help="JSON results from a previous run to compare against")
+    parser.add_argument('--threshold', type=float, default=1.2, help="allowed slowdown ratio before flagging a regression")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args)
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for line in regressions:
+            print(f"Regression: {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,497 @@
+import csv
+import json
+import math
+import os
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from datetime import datetime, time, timedelta
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+
+try:
+    import numpy as np
+except ImportError:  # Only needed to evaluate a TaxSchedule over arrays
+    np = None
+
+# Milestone items with prices
+MILESTONE_ITEMS = [
+    (5, "a coffee"),
+    (10, "a sandwich"),
+    (15, "a movie ticket"),
+    (25, "a pizza"),
+    (50, "a nice dinner"),
+    (75, "a new video game"),
+    (100, "a pair of shoes"),
+    (150, "a smartwatch"),
+    (200, "a weekend trip"),
+    (300, "a new phone"),
+    (500, "a gaming console"),
+    (750, "a nice laptop"),
+    (1000, "a used car down payment"),
+]
+
+def read_rows(path, header, json_rows):
+    # Rows of a .json file, picked out of the parsed document by json_rows(),
+    # or of a CSV file with blank lines, '#' comments and an optional header
+    # row (first cell equal to `header`) dropped
+    if os.path.splitext(path)[1].lower() == '.json':
+        with open(path) as f:
+            return json_rows(json.load(f))
+    with open(path, newline='') as f:
+        rows = [row for row in csv.reader(f) if row and not row[0].startswith('#')]
+    if rows and rows[0][0].strip().lower() == header:
+        rows = rows[1:]
+    return rows
+
+def load_milestone_items(path):
+    # Accepts a JSON list of [price, name] pairs or {"price": ..., "name": ...}
+    # objects, or a CSV file with price,name rows
+    rows = read_rows(path, 'price', lambda items: [
+        (row['price'], row['name']) if isinstance(row, dict) else row for row in items
+    ])
+    return [(float(price), str(name).strip()) for price, name in rows]
+
+class MilestoneIndex:
+    # Milestones sorted by price with a pointer to the next one still locked, so
+    # checking the current earnings is one comparison regardless of catalog size
+    def __init__(self, items):
+        ordered = sorted(items, key=lambda item: item[0])
+        self.prices = [price for price, _ in ordered]
+        self.names = [name for _, name in ordered]
+        self.cents = [to_cents(price) for price in self.prices]  # Converted once for ETA lookups
+        self.next_index = 0
+
+    def __len__(self):
+        return len(self.prices)
+
+    @property
+    def next_milestone(self):
+        if self.next_index >= len(self.prices):
+            return None
+        return self.prices[self.next_index], self.names[self.next_index]
+
+    @property
+    def unlocked(self):
+        return list(zip(self.prices[:self.next_index], self.names[:self.next_index]))
+
+    def unlock(self, earnings):
+        # Returns the (price, item_name) pairs newly reached at this earnings level
+        if self.next_index >= len(self.prices) or earnings < self.prices[self.next_index]:
+            return []
+
+        start = self.next_index
+        self.next_index = bisect_right(self.prices, earnings, lo=start)
+        return list(zip(self.prices[start:self.next_index], self.names[start:self.next_index]))
+
+def parse_time(time_str, now=None):
+    try:
+        hours, minutes = map(int, time_str.split(':'))
+        now = now or datetime.now()
+        clock_in = now.replace(hour=hours, minute=minutes, second=0, microsecond=0)
+
+        if clock_in > now:
+            clock_in -= timedelta(days=1)
+
+        return clock_in
+    except ValueError:
+        return None
+
+def whole_minutes(start_time, end_time):
+    return int((end_time - start_time).total_seconds() / 60)
+
+# Money is counted in integer cents so the tracker, the history and the batch
+# payroll run round exactly the same way. Wages are rounded to the cent and tax
+# rates to a hundredth of a percent (basis points), both half up.
+def to_cents(amount):
+    try:
+        return int(Decimal(str(amount).strip()).quantize(Decimal('0.01'), ROUND_HALF_UP) * 100)
+    except InvalidOperation:
+        raise ValueError(f"Invalid amount: {amount}")
+
+def to_basis_points(rate):
+    try:
+        return int((Decimal(str(rate).strip()) * 10000).quantize(Decimal('1'), ROUND_HALF_UP))
+    except InvalidOperation:
+        raise ValueError(f"Invalid rate: {rate}")
+
+def minute_earnings_cents(wage_cents, minutes):
+    # Pay for completed minutes only, rounded half up to the cent once for the
+    # whole total so it cannot drift minute by minute
+    return (wage_cents * minutes + 30) // 60
+
+def format_cents(cents, grouping=False):
+    sign = '-' if cents < 0 else ''
+    dollars, cents = divmod(abs(cents), 100)
+    if grouping:
+        return f"{sign}{dollars:,}.{cents:02d}"
+    return f"{sign}{dollars}.{cents:02d}"
+
+class TaxSchedule:
+    # Progressive tax from any number of bracket layers (federal, state,
+    # FICA-style capped rates, ...). All layers are merged into one table of
+    # thresholds in cents with the combined marginal rate above each and the
+    # exact tax owed at each, so any amount is one bisect, one multiply and one
+    # add. Tax is tracked in cent * basis point units and rounded once.
+    def __init__(self, layers=()):
+        # layers: (name, [(threshold_cents, rate_basis_points), ...]) pairs
+        self.layers = [(name, sorted(brackets)) for name, brackets in layers]
+        self.thresholds = sorted({0} | {threshold for _, brackets in self.layers for threshold, _ in brackets})
+        self.rates = [
+            sum(self.marginal_rate(brackets, threshold) for _, brackets in self.layers)
+            for threshold in self.thresholds
+        ]
+        self.cumulative = [0]
+        for i in range(1, len(self.thresholds)):
+            width = self.thresholds[i] - self.thresholds[i - 1]
+            self.cumulative.append(self.cumulative[-1] + width * self.rates[i - 1])
+
+    @staticmethod
+    def marginal_rate(brackets, amount_cents):
+        rate = 0
+        for threshold, bracket_rate in brackets:
+            if threshold > amount_cents:
+                break
+            rate = bracket_rate
+        return rate
+
+    def __bool__(self):
+        return bool(self.layers)
+
+    def tax_units(self, earnings_cents):
+        i = max(0, bisect_right(self.thresholds, earnings_cents) - 1)
+        return self.cumulative[i] + (earnings_cents - self.thresholds[i]) * self.rates[i]
+
+    def tax_cents(self, earnings_cents, flat_basis_points=0):
+        # A flat rate (the tax typed into the tracker) is added on top as one more layer
+        units = self.tax_units(earnings_cents) + earnings_cents * flat_basis_points
+        return (units + 5000) // 10000
+
+    def tax_cents_array(self, earnings_cents, flat_basis_points=0):
+        # tax_cents() over an int64 array of earnings; flat_basis_points may be
+        # a scalar or an array of the same length
+        thresholds = np.asarray(self.thresholds, dtype=np.int64)
+        earnings_cents = np.asarray(earnings_cents, dtype=np.int64)
+        i = np.maximum(np.searchsorted(thresholds, earnings_cents, side='right') - 1, 0)
+        units = np.asarray(self.cumulative, dtype=np.int64)[i]
+        units += (earnings_cents - thresholds[i]) * np.asarray(self.rates, dtype=np.int64)[i]
+        units += earnings_cents * flat_basis_points
+        return (units + 5000) // 10000
+
+def load_tax_schedule(path):
+    # JSON: {"periods_per_year": 26, "layers": [{"name": "federal",
+    # "brackets": [[0, 10], [11600, 12], ...]}, ...]} with thresholds in dollars
+    # and rates in percent; brackets may also be {"over": ..., "rate": ...}.
+    # CSV: layer,over,rate rows. Thresholds are divided by periods_per_year
+    # (default 1), so annual tables can be applied to a single shift.
+    # Rows are grouped into layers by name, except that each JSON layer stands
+    # on its own (keyed by its position), even unnamed or sharing a name
+    config = {}
+
+    def json_rows(document):
+        config.update(document)
+        return [
+            ((i, str(layer.get('name', ''))), *(
+                (row['over'], row['rate']) if isinstance(row, dict) else row
+            ))
+            for i, layer in enumerate(document['layers'])
+            for row in layer['brackets']
+        ]
+
+    layers = {}
+    for key, over, rate in read_rows(path, 'layer', json_rows):
+        layers.setdefault(key if isinstance(key, tuple) else key.strip(), []).append((over, rate))
+
+    periods = Decimal(str(config.get('periods_per_year', 1)))
+    return TaxSchedule([
+        (key[1] if isinstance(key, tuple) else key, [
+            (to_cents(Decimal(str(over).strip()) / periods), to_basis_points(Decimal(str(rate).strip()) / 100))
+            for over, rate in brackets
+        ])
+        for key, brackets in layers.items()
+    ])
+
+NO_BRACKETS = TaxSchedule()
+
+WEEKDAYS = ('mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun')
+# How far ahead a shift's rate segments are compiled; later minutes keep the
+# last segment's rate
+RATE_HORIZON_MINUTES = 7 * 24 * 60
+
+# A pay differential active on the given weekdays (None for every day) between
+# start and end minutes of the day (None for all day). Windows that cross
+# midnight belong to the day they start on.
+Differential = namedtuple('Differential', ['name', 'days', 'start', 'end', 'premium_cents', 'multiplier'])
+
+class ShiftRates:
+    # Piecewise-constant pay rate over the minutes of one shift: the minute each
+    # segment starts, its rate in cents per hour, and the pay accrued when it
+    # starts (in cent-minutes per hour), so earnings after any number of minutes
+    # are one bisect. A single segment gives exactly minute_earnings_cents.
+    def __init__(self, starts=(0,), rates=(0,)):
+        self.starts = list(starts)
+        self.rates = list(rates)
+        self.cumulative = [0]
+        for i in range(1, len(self.starts)):
+            self.cumulative.append(self.cumulative[-1] + (self.starts[i] - self.starts[i - 1]) * self.rates[i - 1])
+
+    def __len__(self):
+        return len(self.starts)
+
+    def segment(self, minutes):
+        return max(0, bisect_right(self.starts, minutes) - 1)
+
+    def rate_cents(self, minutes):
+        # Hourly rate in cents for the minute after `minutes` completed minutes
+        return self.rates[self.segment(minutes)]
+
+    def earnings_cents(self, minutes):
+        i = self.segment(minutes)
+        return (self.cumulative[i] + (minutes - self.starts[i]) * self.rates[i] + 30) // 60
+
+    def minutes_to_reach(self, cents):
+        # Fewest completed minutes whose earnings reach `cents`, or None if the
+        # rate drops to zero first
+        target = cents * 60 - 30
+        if target <= 0:
+            return 0
+        i = bisect_left(self.cumulative, target) - 1
+        if self.rates[i] == 0:
+            return None
+        return self.starts[i] + -(-(target - self.cumulative[i]) // self.rates[i])
+
+class RateSchedule:
+    # Overtime tiers and shift differentials. A shift's rate is
+    # (base + premiums) * overtime multiplier * differential multipliers. The
+    # rules are only walked by compile(), once per shift, never per frame.
+    def __init__(self, overtime=(), differentials=()):
+        # overtime: (after_minutes, multiplier) pairs; the highest tier reached applies
+        self.overtime = sorted((after, Decimal(str(multiplier))) for after, multiplier in overtime)
+        self.differentials = list(differentials)
+
+    def __bool__(self):
+        return bool(self.overtime or self.differentials)
+
+    @staticmethod
+    def differential_active(rule, moment):
+        minute = moment.hour * 60 + moment.minute
+        day = moment.weekday()
+        if rule.start is None:
+            return rule.days is None or day in rule.days
+        if rule.start <= rule.end:
+            return rule.start <= minute < rule.end and (rule.days is None or day in rule.days)
+        if minute >= rule.start:
+            return rule.days is None or day in rule.days
+        if minute < rule.end:
+            return rule.days is None or (day - 1) % 7 in rule.days
+        return False
+
+    def rate_cents(self, wage_cents, shift_minute, moment):
+        overtime = Decimal(1)
+        for after, multiplier in self.overtime:
+            if shift_minute >= after:
+                overtime = multiplier
+        premium = 0
+        multiplier = overtime
+        for rule in self.differentials:
+            if self.differential_active(rule, moment):
+                premium += rule.premium_cents
+                multiplier *= rule.multiplier
+        return int(((wage_cents + premium) * multiplier).quantize(Decimal(1), ROUND_HALF_UP))
+
+    def boundaries(self, start_time, horizon):
+        # Minutes into the shift at which some rule can switch on or off
+        offsets = {after for after, _ in self.overtime}
+        edges = {0}
+        for rule in self.differentials:
+            if rule.start is not None:
+                edges.update((rule.start, rule.end))
+        if self.differentials:
+            first_day = start_time.date() - timedelta(days=1)
+            for day in range(horizon // (24 * 60) + 3):
+                midnight = datetime.combine(first_day + timedelta(days=day), time())
+                for edge in edges:
+                    seconds = (midnight + timedelta(minutes=edge) - start_time).total_seconds()
+                    offsets.add(math.ceil(seconds / 60))
+        return sorted(offset for offset in offsets if 0 < offset < horizon)
+
+    def compile(self, hourly_wage, start_time, horizon=RATE_HORIZON_MINUTES):
+        wage_cents = to_cents(hourly_wage)
+        starts, rates = [], []
+        for offset in [0] + self.boundaries(start_time, horizon):
+            rate = self.rate_cents(wage_cents, offset, start_time + timedelta(minutes=offset))
+            if not rates or rate != rates[-1]:
+                starts.append(offset)
+                rates.append(rate)
+        return ShiftRates(starts, rates)
+
+def load_rate_schedule(path):
+    # JSON: {"overtime": [{"after_hours": 8, "multiplier": 1.5}, ...],
+    #        "differentials": [{"name": "night", "start": "22:00", "end": "06:00",
+    #                           "premium": 2.0}, {"name": "weekend",
+    #                           "days": ["sat", "sun"], "multiplier": 1.25}]}
+    with open(path) as f:
+        config = json.load(f)
+
+    overtime = [
+        (round(float(tier['after_hours']) * 60), tier.get('multiplier', 1.5))
+        for tier in config.get('overtime', [])
+    ]
+    differentials = []
+    for rule in config.get('differentials', []):
+        days = rule.get('days')
+        if days is not None:
+            days = frozenset(WEEKDAYS.index(str(day).strip().lower()[:3]) for day in days)
+        start = end = None
+        if 'start' in rule or 'end' in rule:
+            start = clock_minutes(rule.get('start', '00:00'))
+            end = clock_minutes(rule.get('end', '24:00'))
+        differentials.append(Differential(
+            str(rule.get('name', '')), days, start, end,
+            to_cents(rule.get('premium', 0)), Decimal(str(rule.get('multiplier', 1))),
+        ))
+    return RateSchedule(overtime, differentials)
+
+def clock_minutes(text):
+    hours, minutes = map(int, str(text).split(':'))
+    return hours * 60 + minutes
+
+NO_RATE_RULES = RateSchedule()
+
+class EarningsAccumulator:
+    # Running shift total in cents with its display strings. advance() is a
+    # single compare unless the minute count changed since the last call.
+    def __init__(self, rates, tax_rate, tax_schedule=NO_BRACKETS):
+        self.rates = rates
+        self.tax_basis_points = to_basis_points(tax_rate)
+        self.tax_schedule = tax_schedule
+        self.minutes = None
+        self.advance(0)
+
+    def advance(self, minutes):
+        # Returns True when the total changed
+        if minutes == self.minutes:
+            return False
+        self.minutes = minutes
+        self.cents = self.rates.earnings_cents(minutes)
+        self.rate_cents = self.rates.rate_cents(minutes)
+        self.tax_cents = self.tax_schedule.tax_cents(self.cents, self.tax_basis_points)
+        self.after_tax_cents = self.cents - self.tax_cents
+        self.earnings_text = f"${format_cents(self.cents)}"
+        self.after_tax_text = f"${format_cents(self.after_tax_cents)}"
+        self.tax_text = f"${format_cents(self.tax_cents)}"
+        return True
+
+    @property
+    def earnings(self):
+        return self.cents / 100
+
+    @property
+    def after_tax(self):
+        return self.after_tax_cents / 100
+
+    @property
+    def tax(self):
+        return self.tax_cents / 100
+
+def start_shift(wage_text, tax_text, time_text, clock=datetime.now, milestone_items=None, tax_schedule=NO_BRACKETS,
+                rate_schedule=NO_RATE_RULES):
+    try:
+        wage = float(wage_text)
+        tax_rate = float(tax_text) / 100
+    except ValueError:
+        raise ValueError("Invalid wage or tax rate!")
+
+    clock_in = parse_time(time_text, clock())
+    if not (0 < wage < math.inf and 0 <= tax_rate <= 1 and clock_in):
+        raise ValueError("Invalid input!")
+
+    return ShiftEngine(wage, tax_rate, clock_in, clock=clock, milestone_items=milestone_items,
+                       tax_schedule=tax_schedule, rate_schedule=rate_schedule)
+
+class ShiftEngine:
+    def __init__(self, hourly_wage, tax_rate, start_time, clock=datetime.now, milestone_items=None,
+                 tax_schedule=NO_BRACKETS, rate_schedule=NO_RATE_RULES):
+        self.hourly_wage = hourly_wage
+        self.tax_rate = tax_rate
+        self.start_time = start_time
+        self.clock = clock
+        self.milestones = MilestoneIndex(MILESTONE_ITEMS if milestone_items is None else milestone_items)
+        self.last_update_minute = -1
+        self.tax_schedule = tax_schedule
+        # Overtime and differentials compiled into rate segments for this shift
+        self.rates = rate_schedule.compile(hourly_wage, start_time)
+        self.earnings = EarningsAccumulator(self.rates, tax_rate, tax_schedule)
+        # next_milestone_eta() result and the (minutes, next milestone) it was computed for
+        self.eta_key = None
+        self.eta = None
+
+    def hourly_rate(self, minutes=None):
+        # Active pay rate in dollars per hour after `minutes` completed minutes
+        # (by default, as of the last earnings update)
+        return self.rates.rate_cents(self.earnings.minutes if minutes is None else minutes) / 100
+
+    @property
+    def per_minute(self):
+        return self.hourly_rate() / 60
+
+    def elapsed(self, now=None):
+        return (now or self.clock()) - self.start_time
+
+    def elapsed_minutes(self, now=None):
+        return whole_minutes(self.start_time, now or self.clock())
+
+    def calculate_earnings(self, now=None):
+        # Earnings based on completed minutes only, from the cents accumulator
+        total_minutes = self.elapsed_minutes(now)
+        self.earnings.advance(total_minutes)
+        return self.earnings.earnings, total_minutes / 60
+
+    def tax_cents(self, earnings):
+        return self.tax_schedule.tax_cents(to_cents(earnings), self.earnings.tax_basis_points)
+
+    def after_tax(self, earnings):
+        return (to_cents(earnings) - self.tax_cents(earnings)) / 100
+
+    def tax_amount(self, earnings):
+        return self.tax_cents(earnings) / 100
+
+    def effective_tax_rate(self, earnings):
+        # Share of earnings withheld; equals tax_rate when no brackets are configured
+        if not self.tax_schedule:
+            return self.tax_rate
+        cents = to_cents(earnings)
+        return self.tax_cents(earnings) / cents if cents else self.tax_rate
+
+    @property
+    def unlocked_items(self):
+        return {price for price, _ in self.milestones.unlocked}
+
+    def unlock_milestones(self, earnings):
+        return self.milestones.unlock(earnings)
+
+    def next_milestone_eta(self):
+        # Returns (item_name, minutes) from the last earnings update until the
+        # next locked milestone, following any rate changes on the way, or None.
+        # Only recomputed when the minute count or the next milestone changes
+        milestones = self.milestones
+        key = (self.earnings.minutes, milestones.next_index)
+        if key == self.eta_key:
+            return self.eta
+        self.eta_key = key
+        self.eta = None
+        if milestones.next_index < len(milestones):
+            reached_at = self.rates.minutes_to_reach(milestones.cents[milestones.next_index])
+            if reached_at is not None:
+                self.eta = milestones.names[milestones.next_index], max(1, reached_at - self.earnings.minutes)
+        return self.eta
+
+    def check_minute_update(self, now=None):
+        # Returns the cents earned since the last update when a new whole minute
+        # has passed (just the latest minute's pay on the first update), so the
+        # increments always add up to the accumulator's total
+        current_minute = self.elapsed_minutes(now)
+
+        if current_minute > self.last_update_minute:
+            previous = self.last_update_minute if self.last_update_minute >= 0 else max(0, current_minute - 1)
+            self.last_update_minute = current_minute
+            return self.rates.earnings_cents(current_minute) - self.rates.earnings_cents(previous)
+        return None
@@ -1,16 +1,83 @@
-import pygame
 import sys
+
+if __name__ == "__main__" and sys.argv[1:2] in (['payroll'], ['export']):
+    # `python wageTracker.py payroll shifts.csv ...` runs the batch payroll CLI and
+    # `python wageTracker.py export --shifts shifts.csv ...` exports the shift
+    # history. Neither needs pygame, so they are dispatched before it is
+    # imported and its banner can never end up in their output
+    if sys.argv[1] == 'payroll':
+        from payrollBatch import main
+    else:
+        from shiftExport import main
+    sys.exit(main(sys.argv[2:]))
+
+import pygame
 import math
 import random
 import os
-from datetime import datetime, timedelta
+import sqlite3
+import threading
+from collections import OrderedDict
+from itertools import islice
+from datetime import datetime
 
-# Initialize Pygame
-pygame.init()
+try:
+    import numpy as np
+    from shiftAnalytics import ShiftAnalytics, month_start, week_start
+    from shiftExport import EXPORT_DIR, drift_warning, export_history, export_name
+except ImportError:  # NumPy is only needed for the 'numpy' particle backend, the history screen and exports
+    np = None
+    ShiftAnalytics = None
+    export_history = None
+
+from frameProfiler import FrameProfiler
+from shiftCheckpoint import CHECKPOINT_PATH, ShiftCheckpoint, is_stale
+from shiftHistory import HISTORY_PATH, ShiftHistory, record_from_engine
+from statusServer import STATUS_ADDRESS, StatusServer, idle_snapshot, snapshot_from_engine
+from wageEngine import (
+    MILESTONE_ITEMS, NO_BRACKETS, NO_RATE_RULES, ShiftEngine, format_cents, load_milestone_items,
+    load_rate_schedule, load_tax_schedule, start_shift,
+)
 
 # Constants
 WIDTH, HEIGHT = 600, 550
+SCREEN_RECT = pygame.Rect(0, 0, WIDTH, HEIGHT)
 FPS = 60
+IDLE_FPS = 1
+# Posted by the export worker thread once its files are written
+EXPORT_DONE = pygame.USEREVENT + 1
+# Frame pacing: 'fixed' always ticks at FPS, 'adaptive' sleeps until input on
+# static screens and drops to IDLE_FPS on the tracking screen when nothing is
+# animating, 'eco' also lets the money rain idle at IDLE_FPS
+FRAME_MODES = ('fixed', 'adaptive', 'eco')
+FRAME_MODE = os.environ.get('WAGE_TRACKER_FRAME_MODE', 'adaptive')
+# 'numpy' updates the money rain and confetti as arrays and draws them with
+# batched blits; falls back to 'python' when NumPy is not installed
+PARTICLE_BACKEND = os.environ.get('WAGE_TRACKER_PARTICLES', 'python')
+# Frame profiler: WAGE_TRACKER_PROFILE=1 starts with it on, F3 toggles it and
+# its overlay, F4 dumps a JSON trace and F5 starts/stops a cProfile capture
+PROFILE_ENABLED = os.environ.get('WAGE_TRACKER_PROFILE', '') not in ('', '0')
+PROFILE_DIR = os.environ.get('WAGE_TRACKER_PROFILE_DIR', '.')
+# Minute celebrations shake the window; WAGE_TRACKER_SHAKE=0 keeps it still on
+# displays where the extra full-window pass is too expensive
+SHAKE_ENABLED = os.environ.get('WAGE_TRACKER_SHAKE', '1') not in ('', '0')
+HISTORY_CHART_BARS = 12
+# Optional CSV/JSON milestone catalog to use instead of MILESTONE_ITEMS
+MILESTONES_PATH = os.environ.get('WAGE_TRACKER_MILESTONES')
+# Optional CSV/JSON tax bracket layers; the rate typed on the setup screen is
+# then withheld on top of them
+TAX_BRACKETS_PATH = os.environ.get('WAGE_TRACKER_TAX_BRACKETS')
+# Optional JSON overtime and shift differential rules
+RATE_RULES_PATH = os.environ.get('WAGE_TRACKER_RATE_RULES')
+# 'window' is a fixed window, 'resizable' follows the window size and
+# 'fullscreen' fills the monitor. Layout stays in WIDTH x HEIGHT units and is
+# multiplied by the UI scale; fonts and sprites are rasterized at the scaled
+# size once per scale, so frames are never resampled
+DISPLAY_MODES = ('window', 'resizable', 'fullscreen')
+DISPLAY_MODE = os.environ.get('WAGE_TRACKER_DISPLAY', 'window')
+UI_SCALE = float(os.environ.get('WAGE_TRACKER_SCALE', 1))
+MIN_UI_SCALE = 0.5
+UI_SCALE_STEP = 0.125  # Fitted scales snap to this so resizing reuses cached sizes
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 GREEN = (34, 197, 94)
@@ -22,43 +89,414 @@ BLUE = (59, 130, 246)
 RED = (239, 68, 68)
 DARK_RED = (185, 28, 28)
 
-# Setup display
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Real-Time Wage Tracker")
+# Millisecond clock for animations; the benchmark swaps in a simulated one
+tick_source = pygame.time.get_ticks
 
-# Set window icon (works for both script and exe)
-try:
-    if getattr(sys, 'frozen', False):
-        # Running as compiled exe
-        base_path = sys._MEIPASS
+def get_ticks():
+    return tick_source()
+
+# Display, clock and fonts are created by init_display() on first run so the
+# module can be imported without bringing up SDL. `screen` is the scaled
+# canvas everything is drawn on; it is a centered subsurface of `display` when
+# the window has a different aspect ratio
+display = None
+display_mode = DISPLAY_MODE
+screen = None
+screen_origin = (0, 0)
+ui_scale = 1.0
+clock = None
+title_font = None
+large_font = None
+medium_font = None
+small_font = None
+increment_font = None
+
+def px(value):
+    # Layout units to canvas pixels
+    return int(value * ui_scale)
+
+def scaled_rect(x, y, width, height):
+    return pygame.Rect(px(x), px(y), px(width), px(height))
+
+def set_ui_scale(scale):
+    global ui_scale, title_font, large_font, medium_font, small_font, increment_font
+    ui_scale = max(MIN_UI_SCALE, scale)
+    SCREEN_RECT.size = (px(WIDTH), px(HEIGHT))
+    
+    # Fonts come from the per-size cache, so going back to a scale reuses them
+    title_font = get_font(px(48))
+    large_font = get_font(px(64))
+    medium_font = get_font(px(32))
+    small_font = get_font(px(24))
+    increment_font = get_font(px(36))
+    
+    # Every size the milestone zoom-in passes through
+    for size in range(px(MILESTONE_FONT_SIZE * MILESTONE_MIN_SCALE), px(MILESTONE_FONT_SIZE) + 1):
+        get_font(size)
+
+def fit_ui_scale(width, height):
+    fit = min(width / WIDTH, height / HEIGHT)
+    return max(MIN_UI_SCALE, int(fit / UI_SCALE_STEP) * UI_SCALE_STEP)
+
+def resize_display(size):
+    # Picks the scale that fits the window and centers the canvas in it
+    global display, screen, screen_origin
+    display = pygame.display.get_surface()
+    set_ui_scale(fit_ui_scale(*size))
+    canvas = SCREEN_RECT.copy()
+    canvas.center = display.get_rect().center
+    canvas = canvas.clip(display.get_rect())
+    SCREEN_RECT.size = canvas.size
+    screen_origin = canvas.topleft
+    if canvas.size == display.get_size():
+        screen = display
+    else:
+        display.fill(BLACK)
+        screen = display.subsurface(canvas)
+    return screen
+
+def init_display(mode=None, scale=None):
+    global display, display_mode, screen, clock
+    if screen is not None:
+        return screen
+    display_mode = mode or DISPLAY_MODE
+    if display_mode not in DISPLAY_MODES:
+        raise ValueError(f"Unknown display mode {display_mode!r}, expected one of {DISPLAY_MODES}")
+    
+    # Initialize Pygame
+    pygame.init()
+    
+    # Setup display
+    set_ui_scale(UI_SCALE if scale is None else scale)
+    if display_mode == 'fullscreen':
+        display = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+    elif display_mode == 'resizable':
+        display = pygame.display.set_mode(SCREEN_RECT.size, pygame.RESIZABLE)
     else:
-        # Running as script
-        base_path = os.path.dirname(os.path.abspath(__file__))
+        display = pygame.display.set_mode(SCREEN_RECT.size)
+    pygame.display.set_caption("Real-Time Wage Tracker")
+    if display_mode == 'window':
+        screen = display
+    else:
+        resize_display(display.get_size())
     
-    icon_path = os.path.join(base_path, 'icon.png')
-    icon = pygame.image.load(icon_path)
-    pygame.display.set_icon(icon)
-except Exception as e:
-    pass  # If icon file not found, just skip it
+    # Set window icon (works for both script and exe)
+    try:
+        if getattr(sys, 'frozen', False):
+            # Running as compiled exe
+            base_path = sys._MEIPASS
+        else:
+            # Running as script
+            base_path = os.path.dirname(os.path.abspath(__file__))
+        
+        icon_path = os.path.join(base_path, 'icon.png')
+        icon = pygame.image.load(icon_path)
+        pygame.display.set_icon(icon)
+    except Exception as e:
+        pass  # If icon file not found, just skip it
+    
+    clock = pygame.time.Clock()
+    return screen
 
-clock = pygame.time.Clock()
+# Rendered text surfaces shared by every widget, keyed by (font, text, color,
+# antialias). Surfaces are shared, so callers must not modify them in place
+TEXT_CACHE_SIZE = 512
 
-# Fonts
-title_font = pygame.font.Font(None, 48)
-large_font = pygame.font.Font(None, 64)
-medium_font = pygame.font.Font(None, 32)
-small_font = pygame.font.Font(None, 24)
-increment_font = pygame.font.Font(None, 36)
+class TextCache:
+    def __init__(self, max_size=TEXT_CACHE_SIZE):
+        self.max_size = max_size
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def render(self, font, text, antialias, color):
+        key = (font, text, color, antialias)
+        text_surf = self.surfaces.get(key)
+        if text_surf is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return text_surf
+        
+        self.misses += 1
+        text_surf = font.render(text, antialias, color)
+        self.surfaces[key] = text_surf
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+        return text_surf
+    
+    def clear(self):
+        self.surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+
+text_cache = TextCache()
+
+def render_text(font, text, antialias, color):
+    return text_cache.render(font, text, antialias, color)
+
+def blit_alpha(surface, source, dest, alpha):
+    # Fade a cached surface for this blit only, leaving it opaque for other users
+    source.set_alpha(alpha)
+    rect = surface.blit(source, dest)
+    source.set_alpha(None)
+    return rect
+
+# Money rain sprite caches
+MONEY_TYPES = ('dollar', 'coin', 'bill')
+MONEY_MIN_SIZE, MONEY_MAX_SIZE = 25, 45
+MONEY_ROTATION_STEPS = 72  # 5 degree buckets
+# Every type, size and angle bucket at one UI scale, so however many symbols
+# are falling the rotations are only ever rendered once
+MONEY_ROTATION_CACHE_SIZE = len(MONEY_TYPES) * (MONEY_MAX_SIZE - MONEY_MIN_SIZE + 1) * MONEY_ROTATION_STEPS
+
+_font_cache = {}
+_money_sprites = {}
+_money_rotations = OrderedDict()
+
+def get_font(size):
+    font = _font_cache.get(size)
+    if font is None:
+        font = pygame.font.Font(None, size)
+        _font_cache[size] = font
+    return font
+
+def render_money_sprite(money_type, size):
+    money_surf = pygame.Surface((size, size), pygame.SRCALPHA)
+    
+    if money_type == 'dollar':
+        text = get_font(size).render('$', True, (0, 128, 0))
+        money_surf.blit(text, (0, 0))
+    elif money_type == 'coin':
+        pygame.draw.circle(money_surf, (255, 215, 0), (size//2, size//2), size//2)
+        pygame.draw.circle(money_surf, (218, 165, 32), (size//2, size//2), size//2, px(3))
+        text = get_font(int(size * 0.7)).render('$', True, (218, 165, 32))
+        text_rect = text.get_rect(center=(size//2, size//2))
+        money_surf.blit(text, text_rect)
+    else:
+        pygame.draw.rect(money_surf, (85, 170, 85), (0, size//4, size, size//2))
+        pygame.draw.rect(money_surf, (0, 100, 0), (0, size//4, size, size//2), px(2))
+        text = get_font(int(size * 0.6)).render('$', True, (0, 100, 0))
+        text_rect = text.get_rect(center=(size//2, size//2))
+        money_surf.blit(text, text_rect)
+    
+    return money_surf
+
+def get_money_sprite(money_type, size):
+    # Sizes are in canvas pixels; outlines follow the UI scale
+    key = (money_type, size, ui_scale)
+    sprite = _money_sprites.get(key)
+    if sprite is None:
+        sprite = render_money_sprite(money_type, size)
+        _money_sprites[key] = sprite
+    return sprite
+
+def get_rotated_money_sprite(money_type, size, rotation):
+    # Snap the angle to a bucket so every symbol shares a small set of rotated images
+    step = 360 / MONEY_ROTATION_STEPS
+    bucket = int(round((rotation % 360) / step)) % MONEY_ROTATION_STEPS
+    key = (money_type, size, ui_scale, bucket)
+    rotated = _money_rotations.get(key)
+    if rotated is not None:
+        _money_rotations.move_to_end(key)
+        return rotated
+    
+    rotated = pygame.transform.rotate(get_money_sprite(money_type, size), bucket * step)
+    _money_rotations[key] = rotated
+    if len(_money_rotations) > MONEY_ROTATION_CACHE_SIZE:
+        _money_rotations.popitem(last=False)
+    return rotated
+
+# Rainbow celebration background
+RAINBOW_STEPS_PER_DEGREE = 2  # Background rows advance the hue by half a degree
+
+_rainbow_lut = []
+_rainbow_strips = {}
+
+def hue_to_rgb(offset):
+    hue = (offset % 360) / 360.0
+    h = hue * 6
+    c = 1
+    x = 1 - abs(h % 2 - 1)
+    if h < 1:
+        r, g, b = c, x, 0
+    elif h < 2:
+        r, g, b = x, c, 0
+    elif h < 3:
+        r, g, b = 0, c, x
+    elif h < 4:
+        r, g, b = 0, x, c
+    elif h < 5:
+        r, g, b = x, 0, c
+    else:
+        r, g, b = c, 0, x
+    return (int(r * 255), int(g * 255), int(b * 255))
+
+def get_rainbow_lut():
+    if not _rainbow_lut:
+        steps = 360 * RAINBOW_STEPS_PER_DEGREE
+        _rainbow_lut.extend(hue_to_rgb(i / RAINBOW_STEPS_PER_DEGREE) for i in range(steps))
+    return _rainbow_lut
+
+def get_rainbow_strip():
+    # One full hue cycle plus a canvas's worth of rows, so any offset can be
+    # shown with a single blit of a canvas-tall slice. One strip per canvas size
+    width, height = SCREEN_RECT.size
+    strip = _rainbow_strips.get((width, height))
+    if strip is None:
+        lut = get_rainbow_lut()
+        rows = len(lut) + height
+        column = pygame.Surface((1, rows))
+        for i in range(rows):
+            column.set_at((0, i), lut[i % len(lut)])
+        strip = pygame.transform.scale(column, (width, rows))
+        _rainbow_strips[(width, height)] = strip
+    return strip
+
+# Milestone banners (text on a translucent box), pre-rendered once per item
+# and font size so the zoom-in only swaps sprites and fades them at blit time
+MILESTONE_FONT_SIZE = 28
+MILESTONE_MIN_SCALE = 0.8
+MILESTONE_PADDING = 15
+# Banners stacked below the canvas never fetch a sprite, so each frame only
+# the handful that fit on screen do; this holds every zoom size of far more
+MILESTONE_SPRITE_CACHE_SIZE = 256
+
+_milestone_sprites = OrderedDict()
+
+def get_milestone_sprite(item_name, font_size):
+    key = (item_name, font_size, ui_scale)
+    sprite = _milestone_sprites.get(key)
+    if sprite is not None:
+        _milestone_sprites.move_to_end(key)
+        return sprite
+    
+    padding = px(MILESTONE_PADDING)
+    text_surf = get_font(font_size).render(f"You've earned {item_name}!", True, (255, 215, 0))
+    sprite = pygame.Surface(
+        (text_surf.get_width() + padding * 2, text_surf.get_height() + padding),
+        pygame.SRCALPHA
+    )
+    pygame.draw.rect(sprite, (*BLACK, 200), sprite.get_rect(), border_radius=px(8))
+    sprite.blit(text_surf, (padding, padding // 2))
+    
+    _milestone_sprites[key] = sprite
+    if len(_milestone_sprites) > MILESTONE_SPRITE_CACHE_SIZE:
+        _milestone_sprites.popitem(last=False)
+    return sprite
+
+def merge_rects(rects):
+    # Union overlapping rects so each pixel is only restored and pushed once
+    merged = []
+    for rect in rects:
+        rect = rect.clip(SCREEN_RECT)
+        if not rect.width or not rect.height:
+            continue
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+def shake_frame(surface, dx, dy):
+    # Moves the finished frame in place by the shake offset and blacks out the
+    # strips it uncovers, instead of copying it through a second surface
+    if not dx and not dy:
+        return
+    surface.scroll(dx, dy)
+    width, height = surface.get_size()
+    if dx > 0:
+        surface.fill(BLACK, (0, 0, dx, height))
+    elif dx < 0:
+        surface.fill(BLACK, (width + dx, 0, -dx, height))
+    if dy > 0:
+        surface.fill(BLACK, (0, 0, width, dy))
+    elif dy < 0:
+        surface.fill(BLACK, (0, height + dy, width, -dy))
+
+# Particle pools: objects are allocated up front and reused, and dead ones are
+# compacted out in place instead of rebuilding lists every frame
+MONEY_RAIN_COUNT = int(os.environ.get('WAGE_TRACKER_MONEY_RAIN', 15))
+CONFETTI_PER_CELEBRATION = int(os.environ.get('WAGE_TRACKER_CONFETTI', 50))
+CONFETTI_CAPACITY = max(500, CONFETTI_PER_CELEBRATION * 4)
+INCREMENT_CAPACITY = 8
+MILESTONE_CAPACITY = 16
+
+CONFETTI_MIN_SIZE, CONFETTI_MAX_SIZE = 4, 10
+CONFETTI_COLORS = [
+    (255, 0, 0), (255, 165, 0), (255, 255, 0), 
+    (0, 255, 0), (0, 127, 255), (139, 0, 255),
+    (255, 20, 147), (0, 255, 255)
+]
+
+class ParticlePool:
+    # Live particles are items[:count] in spawn order; spawning past the
+    # capacity grows the pool, and the extra objects stay around for reuse
+    def __init__(self, factory, capacity):
+        self.factory = factory
+        self.items = [factory() for _ in range(capacity)]
+        self.count = 0
+    
+    def __len__(self):
+        return self.count
+    
+    def __iter__(self):
+        return islice(self.items, self.count)
+    
+    def spawn(self, *args):
+        if self.count == len(self.items):
+            self.items.append(self.factory())
+        particle = self.items[self.count]
+        particle.reset(*args)
+        self.count += 1
+        return particle
+    
+    def update(self, stack_spacing=None):
+        # Stable in-place compaction: survivors slide down over dead particles
+        items = self.items
+        alive = 0
+        for i in range(self.count):
+            particle = items[i]
+            if stack_spacing is None:
+                keep = particle.update()
+            else:
+                keep = particle.update(y_offset=i * stack_spacing)
+            if keep:
+                if i != alive:
+                    items[i], items[alive] = items[alive], particle
+                alive += 1
+        self.count = alive
+    
+    def spawn_batch(self, n):
+        for _ in range(n):
+            self.spawn()
+    
+    def get_rects(self):
+        # Particles entirely off the canvas have nothing to restore or push
+        return [rect for rect in (particle.get_rect() for particle in self) if rect.colliderect(SCREEN_RECT)]
+    
+    def draw(self, surface):
+        for particle in self:
+            particle.draw(surface)
+    
+    def clear(self):
+        self.count = 0
 
 class MoneySymbol:
+    __slots__ = ('x', 'y', 'size', 'speed', 'rotation', 'rotation_speed', 'type', 'sprite', 'rect')
+    
     def __init__(self):
+        self.reset()
+    
+    def reset(self):
         self.x = random.randint(0, WIDTH)
         self.y = random.randint(-100, -20)
-        self.size = random.randint(25, 45)
+        self.size = random.randint(MONEY_MIN_SIZE, MONEY_MAX_SIZE)
         self.speed = random.uniform(1, 3)
         self.rotation = random.uniform(0, 360)
         self.rotation_speed = random.uniform(-3, 3)
-        self.type = random.choice(['dollar', 'coin', 'bill'])
+        self.type = random.choice(MONEY_TYPES)
+        self.sprite = None
     
     def update(self):
         self.y += self.speed
@@ -66,44 +504,34 @@ class MoneySymbol:
         if self.y > HEIGHT + 50:
             self.y = random.randint(-100, -20)
             self.x = random.randint(0, WIDTH)
+        self.sprite = None
         return True
     
+    def place(self):
+        # Looked up once per frame and shared by get_rect() and draw()
+        if self.sprite is None:
+            self.sprite = get_rotated_money_sprite(self.type, px(self.size), self.rotation)
+            self.rect = self.sprite.get_rect(center=(px(self.x), px(self.y)))
+    
+    def get_rect(self):
+        self.place()
+        return self.rect
+    
     def draw(self, surface):
-        money_surf = pygame.Surface((self.size, self.size), pygame.SRCALPHA)
-        
-        if self.type == 'dollar':
-            font = pygame.font.Font(None, self.size)
-            text = font.render('$', True, (0, 128, 0))
-            money_surf.blit(text, (0, 0))
-        elif self.type == 'coin':
-            pygame.draw.circle(money_surf, (255, 215, 0), (self.size//2, self.size//2), self.size//2)
-            pygame.draw.circle(money_surf, (218, 165, 32), (self.size//2, self.size//2), self.size//2, 3)
-            font = pygame.font.Font(None, int(self.size * 0.7))
-            text = font.render('$', True, (218, 165, 32))
-            text_rect = text.get_rect(center=(self.size//2, self.size//2))
-            money_surf.blit(text, text_rect)
-        else:
-            pygame.draw.rect(money_surf, (85, 170, 85), (0, self.size//4, self.size, self.size//2))
-            pygame.draw.rect(money_surf, (0, 100, 0), (0, self.size//4, self.size, self.size//2), 2)
-            font = pygame.font.Font(None, int(self.size * 0.6))
-            text = font.render('$', True, (0, 100, 0))
-            text_rect = text.get_rect(center=(self.size//2, self.size//2))
-            money_surf.blit(text, text_rect)
-        
-        rotated = pygame.transform.rotate(money_surf, self.rotation)
-        rect = rotated.get_rect(center=(int(self.x), int(self.y)))
-        surface.blit(rotated, rect)
+        self.place()
+        surface.blit(self.sprite, self.rect)
 
 class Confetti:
+    __slots__ = ('x', 'y', 'size', 'color', 'speed', 'rotation', 'rotation_speed')
+    
     def __init__(self):
+        self.reset()
+    
+    def reset(self):
         self.x = random.randint(0, WIDTH)
         self.y = -10
-        self.size = random.randint(4, 10)
-        self.color = random.choice([
-            (255, 0, 0), (255, 165, 0), (255, 255, 0), 
-            (0, 255, 0), (0, 127, 255), (139, 0, 255),
-            (255, 20, 147), (0, 255, 255)
-        ])
+        self.size = random.randint(CONFETTI_MIN_SIZE, CONFETTI_MAX_SIZE)
+        self.color = random.choice(CONFETTI_COLORS)
         self.speed = random.uniform(2, 5)
         self.rotation = random.uniform(0, 360)
         self.rotation_speed = random.uniform(-5, 5)
@@ -113,21 +541,190 @@ class Confetti:
         self.rotation += self.rotation_speed
         return self.y < HEIGHT + 20
     
+    def get_rect(self):
+        size = px(self.size)
+        return pygame.Rect(px(self.x) - size, px(self.y) - size, size * 2, size * 2)
+    
+    def draw(self, surface):
+        pygame.draw.circle(surface, self.color, (px(self.x), px(self.y)), px(self.size))
+
+# NumPy particle backend: same behaviour as MoneySymbol/Confetti on a
+# ParticlePool, but positions live in arrays updated in one vectorized step,
+# respawn/culling use boolean masks and drawing is one Surface.blits call
+_confetti_sprites = {}
+
+def get_confetti_sprite(color, size):
+    key = (color, size)
+    sprite = _confetti_sprites.get(key)
+    if sprite is None:
+        # Colorkeyed (not per-pixel alpha) so batched blits stay cheap
+        sprite = pygame.Surface((size * 2 + 1, size * 2 + 1)).convert()
+        sprite.fill(BLACK)
+        pygame.draw.circle(sprite, color, (size, size), size)
+        sprite.set_colorkey(BLACK, pygame.RLEACCEL)
+        _confetti_sprites[key] = sprite
+    return sprite
+
+class NumpyParticles:
+    fields = ()
+    
+    def __init__(self, capacity):
+        self.rng = np.random.default_rng()
+        self.count = 0
+        self.sequence = None  # This frame's blit_sequence(), shared by get_rects() and draw()
+        self.arrays = {}
+        for name, dtype in self.fields:
+            self.arrays[name] = np.zeros(capacity, dtype=dtype)
+    
+    def __len__(self):
+        return self.count
+    
+    def spawn_batch(self, n):
+        capacity = len(self.arrays[self.fields[0][0]])
+        if self.count + n > capacity:
+            new_capacity = max(capacity * 2, self.count + n)
+            for name, array in self.arrays.items():
+                grown = np.zeros(new_capacity, dtype=array.dtype)
+                grown[:self.count] = array[:self.count]
+                self.arrays[name] = grown
+        self.randomize(self.count, self.count + n)
+        self.count += n
+        self.sequence = None
+    
+    def spawn(self):
+        self.spawn_batch(1)
+    
+    def compact(self, alive):
+        kept = int(np.count_nonzero(alive))
+        if kept != self.count:
+            for array in self.arrays.values():
+                array[:kept] = array[:self.count][alive]
+            self.count = kept
+    
+    def frame_sequence(self):
+        if self.sequence is None:
+            self.sequence = self.blit_sequence()
+        return self.sequence
+    
+    def get_rects(self):
+        return [pygame.Rect(pos, sprite.get_size()) for sprite, pos in self.frame_sequence()]
+    
     def draw(self, surface):
-        pygame.draw.circle(surface, self.color, (int(self.x), int(self.y)), self.size)
+        surface.blits(self.frame_sequence(), doreturn=False)
+    
+    def clear(self):
+        self.count = 0
+        self.sequence = None
+
+class NumpyMoneyRain(NumpyParticles):
+    fields = (
+        ('x', 'f8'), ('y', 'f8'),
+        ('size', 'i4'), ('speed', 'f8'),
+        ('rotation', 'f8'), ('rotation_speed', 'f8'),
+        ('type', 'i1'),
+    )
+    
+    def randomize(self, start, end):
+        n = end - start
+        a = self.arrays
+        a['x'][start:end] = self.rng.integers(0, WIDTH, n, endpoint=True)
+        a['y'][start:end] = self.rng.integers(-100, -20, n, endpoint=True)
+        a['size'][start:end] = self.rng.integers(MONEY_MIN_SIZE, MONEY_MAX_SIZE, n, endpoint=True)
+        a['speed'][start:end] = self.rng.uniform(1, 3, n)
+        a['rotation'][start:end] = self.rng.uniform(0, 360, n)
+        a['rotation_speed'][start:end] = self.rng.uniform(-3, 3, n)
+        a['type'][start:end] = self.rng.integers(0, len(MONEY_TYPES), n)
+    
+    def update(self):
+        self.sequence = None
+        n = self.count
+        a = self.arrays
+        y = a['y'][:n]
+        y += a['speed'][:n]
+        a['rotation'][:n] += a['rotation_speed'][:n]
+        
+        respawn = y > HEIGHT + 50
+        respawned = int(np.count_nonzero(respawn))
+        if respawned:
+            y[respawn] = self.rng.integers(-100, -20, respawned, endpoint=True)
+            a['x'][:n][respawn] = self.rng.integers(0, WIDTH, respawned, endpoint=True)
+    
+    def blit_sequence(self):
+        n = self.count
+        a = self.arrays
+        sequence = []
+        for x, y, size, rotation, type_index in zip(
+            (a['x'][:n] * ui_scale).astype(int).tolist(), (a['y'][:n] * ui_scale).astype(int).tolist(),
+            (a['size'][:n] * ui_scale).astype(int).tolist(), a['rotation'][:n].tolist(), a['type'][:n].tolist()
+        ):
+            rotated = get_rotated_money_sprite(MONEY_TYPES[type_index], size, rotation)
+            width, height = rotated.get_size()
+            sequence.append((rotated, (x - width // 2, y - height // 2)))
+        return sequence
+
+class NumpyConfetti(NumpyParticles):
+    sprite_tables = {}  # UI scale -> flat (color, size) sprite table
+    fields = (
+        ('x', 'f8'), ('y', 'f8'),
+        ('size', 'i4'), ('color', 'i1'),
+        ('speed', 'f8'), ('rotation', 'f8'),
+        ('rotation_speed', 'f8'),
+    )
+    
+    def randomize(self, start, end):
+        n = end - start
+        a = self.arrays
+        a['x'][start:end] = self.rng.integers(0, WIDTH, n, endpoint=True)
+        a['y'][start:end] = -10
+        a['size'][start:end] = self.rng.integers(CONFETTI_MIN_SIZE, CONFETTI_MAX_SIZE, n, endpoint=True)
+        a['color'][start:end] = self.rng.integers(0, len(CONFETTI_COLORS), n)
+        a['speed'][start:end] = self.rng.uniform(2, 5, n)
+        a['rotation'][start:end] = self.rng.uniform(0, 360, n)
+        a['rotation_speed'][start:end] = self.rng.uniform(-5, 5, n)
+    
+    def update(self):
+        self.sequence = None
+        n = self.count
+        a = self.arrays
+        a['y'][:n] += a['speed'][:n]
+        a['rotation'][:n] += a['rotation_speed'][:n]
+        self.compact(a['y'][:n] < HEIGHT + 20)
+    
+    def blit_sequence(self):
+        # Sprites are looked up in a flat (color, size) table by a vectorized index
+        sprites = self.sprite_tables.get(ui_scale)
+        if sprites is None:
+            sprites = self.sprite_tables[ui_scale] = [
+                get_confetti_sprite(color, px(size))
+                for color in CONFETTI_COLORS
+                for size in range(CONFETTI_MIN_SIZE, CONFETTI_MAX_SIZE + 1)
+            ]
+        n = self.count
+        a = self.arrays
+        sizes = a['size'][:n]
+        sprite_index = (a['color'][:n] * (CONFETTI_MAX_SIZE - CONFETTI_MIN_SIZE + 1) + sizes - CONFETTI_MIN_SIZE).tolist()
+        radii = (sizes * ui_scale).astype(int)
+        xs = ((a['x'][:n] * ui_scale).astype(int) - radii).tolist()
+        ys = ((a['y'][:n] * ui_scale).astype(int) - radii).tolist()
+        return [(sprites[i], (x, y)) for i, x, y in zip(sprite_index, xs, ys)]
 
 class FadingIncrement:
-    def __init__(self, amount, x, y):
+    __slots__ = ('amount', 'x', 'y', 'alpha', 'y_offset', 'duration', 'start_time')
+    
+    def __init__(self, amount=0, x=0, y=0):
+        self.reset(amount, x, y)
+    
+    def reset(self, amount, x, y):
         self.amount = amount
         self.x = x
         self.y = y
         self.alpha = 255
         self.y_offset = 0
         self.duration = 2000
-        self.start_time = pygame.time.get_ticks()
+        self.start_time = get_ticks()
     
     def update(self):
-        elapsed = pygame.time.get_ticks() - self.start_time
+        elapsed = get_ticks() - self.start_time
         progress = elapsed / self.duration
         
         if progress >= 1:
@@ -137,25 +734,35 @@ class FadingIncrement:
         self.y_offset = int(30 * progress)
         return True
     
+    def get_rect(self):
+        width, height = increment_font.size(f"+${format_cents(self.amount)}")
+        return pygame.Rect(px(self.x), px(self.y - self.y_offset), width, height)
+    
     def draw(self, surface):
-        text = f"+${self.amount:.2f}"
-        text_surf = increment_font.render(text, True, GREEN)
-        text_surf.set_alpha(self.alpha)
-        surface.blit(text_surf, (self.x, self.y - self.y_offset))
+        text = f"+${format_cents(self.amount)}"
+        text_surf = render_text(increment_font, text, True, GREEN)
+        blit_alpha(surface, text_surf, (px(self.x), px(self.y - self.y_offset)), self.alpha)
 
 class FadingMilestone:
-    def __init__(self, item_name, x, y):
+    __slots__ = ('item_name', 'x', 'y', 'alpha', 'duration', 'start_time', 'scale', 'sprite', 'rect')
+    
+    def __init__(self, item_name='', x=0, y=0):
+        self.reset(item_name, x, y)
+    
+    def reset(self, item_name, x, y):
         self.item_name = item_name
         self.x = x
         self.y = y
         self.alpha = 0
         self.duration = 3000
-        self.start_time = pygame.time.get_ticks()
+        self.start_time = get_ticks()
         self.scale = 1.0
+        self.rect = None
     
     def update(self, y_offset=0):
         self.y = 280 + y_offset  # Base position plus offset for stacking
-        elapsed = pygame.time.get_ticks() - self.start_time
+        self.rect = None
+        elapsed = get_ticks() - self.start_time
         progress = elapsed / self.duration
         
         if progress >= 1:
@@ -164,7 +771,7 @@ class FadingMilestone:
         # Fade in first 15%, hold middle 70%, fade out last 15%
         if progress < 0.15:
             self.alpha = int(255 * (progress / 0.15))
-            self.scale = 0.8 + (0.2 * (progress / 0.15))
+            self.scale = MILESTONE_MIN_SCALE + ((1 - MILESTONE_MIN_SCALE) * (progress / 0.15))
         elif progress < 0.85:
             self.alpha = 255
             self.scale = 1.0
@@ -175,42 +782,48 @@ class FadingMilestone:
         
         return True
     
-    def draw(self, surface):
-        text = f"You've earned {self.item_name}!"
-        font_size = int(28 * self.scale)
-        font = pygame.font.Font(None, font_size)
-        text_surf = font.render(text, True, (255, 215, 0))
-        text_surf.set_alpha(self.alpha)
-        text_rect = text_surf.get_rect(center=(self.x, self.y))
-        
-        # Draw background box
-        padding = 15
-        box_rect = pygame.Rect(
-            text_rect.x - padding,
-            text_rect.y - padding // 2,
-            text_rect.width + padding * 2,
-            text_rect.height + padding
-        )
-        box_surf = pygame.Surface((box_rect.width, box_rect.height), pygame.SRCALPHA)
-        box_color = (*BLACK, int(200 * (self.alpha / 255)))
-        pygame.draw.rect(box_surf, box_color, box_surf.get_rect(), border_radius=8)
-        surface.blit(box_surf, (box_rect.x, box_rect.y))
+    def place(self):
+        # Sprite and rect are looked up once per frame and shared by get_rect()
+        # and draw(); banners stacked below the canvas skip the lookup entirely
+        if self.rect is not None:
+            return
+        top = px(self.y - MILESTONE_FONT_SIZE - MILESTONE_PADDING)
+        if top >= SCREEN_RECT.bottom:
+            self.sprite = None
+            self.rect = pygame.Rect(px(self.x), top, 0, 0)
+            return
         
-        # Draw text
-        surface.blit(text_surf, text_rect)
+        self.sprite = get_milestone_sprite(self.item_name, px(MILESTONE_FONT_SIZE * self.scale))
+        padding = px(MILESTONE_PADDING)
+        text_rect = pygame.Rect(0, 0, self.sprite.get_width() - padding * 2, self.sprite.get_height() - padding)
+        text_rect.center = (px(self.x), px(self.y))
+        self.rect = self.sprite.get_rect(topleft=(text_rect.x - padding, text_rect.y - padding // 2))
+    
+    def get_rect(self):
+        self.place()
+        return self.rect
+    
+    def draw(self, surface):
+        self.place()
+        if self.sprite is not None:
+            blit_alpha(surface, self.sprite, self.rect, self.alpha)
 
 class Button:
     def __init__(self, x, y, width, height, text, color, hover_color):
-        self.rect = pygame.Rect(x, y, width, height)
+        self.layout = (x, y, width, height)
+        self.rect = scaled_rect(*self.layout)
         self.text = text
         self.color = color
         self.hover_color = hover_color
         self.is_hovered = False
     
+    def rescale(self):
+        self.rect = scaled_rect(*self.layout)
+    
     def draw(self, surface):
         color = self.hover_color if self.is_hovered else self.color
-        pygame.draw.rect(surface, color, self.rect, border_radius=10)
-        text_surf = medium_font.render(self.text, True, WHITE)
+        pygame.draw.rect(surface, color, self.rect, border_radius=px(10))
+        text_surf = render_text(medium_font, self.text, True, WHITE)
         text_rect = text_surf.get_rect(center=self.rect.center)
         surface.blit(text_surf, text_rect)
     
@@ -224,20 +837,24 @@ class Button:
 
 class ToggleButton:
     def __init__(self, x, y, width, height, text_on, text_off):
-        self.rect = pygame.Rect(x, y, width, height)
+        self.layout = (x, y, width, height)
+        self.rect = scaled_rect(*self.layout)
         self.text_on = text_on
         self.text_off = text_off
         self.is_on = False
         self.is_hovered = False
     
+    def rescale(self):
+        self.rect = scaled_rect(*self.layout)
+    
     def draw(self, surface):
         color = GREEN if self.is_on else GRAY
         hover_color = DARK_GREEN if self.is_on else (120, 120, 120)
         draw_color = hover_color if self.is_hovered else color
         
-        pygame.draw.rect(surface, draw_color, self.rect, border_radius=8)
+        pygame.draw.rect(surface, draw_color, self.rect, border_radius=px(8))
         text = self.text_on if self.is_on else self.text_off
-        text_surf = small_font.render(text, True, WHITE)
+        text_surf = render_text(small_font, text, True, WHITE)
         text_rect = text_surf.get_rect(center=self.rect.center)
         surface.blit(text_surf, text_rect)
     
@@ -252,24 +869,28 @@ class ToggleButton:
 
 class InputBox:
     def __init__(self, x, y, width, height, label, placeholder=''):
-        self.rect = pygame.Rect(x, y, width, height)
+        self.layout = (x, y, width, height)
+        self.rect = scaled_rect(*self.layout)
         self.label = label
         self.placeholder = placeholder
         self.text = ''
         self.active = False
     
+    def rescale(self):
+        self.rect = scaled_rect(*self.layout)
+    
     def draw(self, surface):
-        label_surf = small_font.render(self.label, True, BLACK)
-        surface.blit(label_surf, (self.rect.x, self.rect.y - 30))
+        label_surf = render_text(small_font, self.label, True, BLACK)
+        surface.blit(label_surf, (self.rect.x, self.rect.y - px(30)))
         
         color = GREEN if self.active else GRAY
-        pygame.draw.rect(surface, LIGHT_GRAY, self.rect, border_radius=8)
-        pygame.draw.rect(surface, color, self.rect, 2, border_radius=8)
+        pygame.draw.rect(surface, LIGHT_GRAY, self.rect, border_radius=px(8))
+        pygame.draw.rect(surface, color, self.rect, px(2), border_radius=px(8))
         
         display_text = self.text if self.text else self.placeholder
         text_color = BLACK if self.text else GRAY
-        text_surf = medium_font.render(display_text, True, text_color)
-        surface.blit(text_surf, (self.rect.x + 10, self.rect.y + 10))
+        text_surf = render_text(medium_font, display_text, True, text_color)
+        surface.blit(text_surf, (self.rect.x + px(10), self.rect.y + px(10)))
     
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
@@ -284,18 +905,38 @@ class InputBox:
                     self.text += event.unicode
 
 class WageTracker:
-    def __init__(self):
-        self.hourly_wage = None
-        self.tax_rate = 0.25
+    def __init__(self, frame_mode=None, clock=datetime.now, particle_backend=None, history_path=HISTORY_PATH,
+                 checkpoint_path=CHECKPOINT_PATH, status_address=STATUS_ADDRESS):
+        self.clock = clock
+        # Completed shifts are journaled here; an empty path turns history off
+        self.history_path = history_path
+        self.history = None
+        self.export_thread = None
+        # The shift in progress is checkpointed here once a minute; an empty
+        # path turns crash recovery off
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint = None
+        # Live state for other local tools; no address turns the endpoint off
+        self.status_address = status_address
+        self.status = None
+        self.engine = None
+        self.particle_backend = particle_backend or PARTICLE_BACKEND
+        self.profiler = FrameProfiler(enabled=PROFILE_ENABLED, output_dir=PROFILE_DIR)
+        if self.particle_backend == 'numpy' and np is None:
+            print("NumPy is not installed, using the python particle backend")
+            self.particle_backend = 'python'
+        self.frame_mode = frame_mode or FRAME_MODE
+        if self.frame_mode not in FRAME_MODES:
+            raise ValueError(f"Unknown frame mode {self.frame_mode!r}, expected one of {FRAME_MODES}")
         self.clock_in_time = None
         self.is_tracking = False
-        self.start_time = None
         self.end_time = None
-        self.last_update_minute = -1
         self.current_earnings = 0
-        self.increments = []
-        self.milestone_messages = []
+        self.increments = ParticlePool(FadingIncrement, INCREMENT_CAPACITY)
+        self.milestone_messages = ParticlePool(FadingMilestone, MILESTONE_CAPACITY)
         self.show_summary = False
+        self.show_history = False
+        self.analytics = None
         self.final_earnings = 0
         self.total_hours = 0
         self.last_milestone = 0
@@ -304,70 +945,88 @@ class WageTracker:
         self.minute_celebration_active = False
         self.minute_celebration_timer = 0
         self.minute_amount = 0
-        self.confetti = []
+        self.next_milestone_eta = None
+        self.next_milestone_label = None
         self.rainbow_offset = 0
-        self.money_rain = []
+        if self.particle_backend == 'numpy':
+            self.confetti = NumpyConfetti(CONFETTI_CAPACITY)
+            self.money_rain = NumpyMoneyRain(MONEY_RAIN_COUNT)
+        else:
+            self.confetti = ParticlePool(Confetti, CONFETTI_CAPACITY)
+            self.money_rain = ParticlePool(MoneySymbol, MONEY_RAIN_COUNT)
+        self.shake_enabled = SHAKE_ENABLED
         self.shake_offset_x = 0
         self.shake_offset_y = 0
-        self.unlocked_items = set()
-        
-        # Milestone items with prices
-        self.milestone_items = [
-            (5, "a coffee"),
-            (10, "a sandwich"),
-            (15, "a movie ticket"),
-            (25, "a pizza"),
-            (50, "a nice dinner"),
-            (75, "a new video game"),
-            (100, "a pair of shoes"),
-            (150, "a smartwatch"),
-            (200, "a weekend trip"),
-            (300, "a new phone"),
-            (500, "a gaming console"),
-            (750, "a nice laptop"),
-            (1000, "a used car down payment"),
-        ]
         
-        for _ in range(15):
-            self.money_rain.append(MoneySymbol())
+        # Tracking screen layers: static panels are cached until their inputs
+        # change, and only rects touched by moving content are pushed to the display
+        self.tracking_overlay = None
+        self.tracking_overlay_key = None
+        self.tracking_dirty_rects = None
+        # Setup, summary and history screens are composed into one surface that
+        # is rebuilt only when its key (inputs, hover states, shift) changes
+        self.static_screen = None
+        self.static_screen_key = None
+        self.static_screen_stale = True
+        
+        self.milestone_items = load_milestone_items(MILESTONES_PATH) if MILESTONES_PATH else MILESTONE_ITEMS
+        self.tax_schedule = load_tax_schedule(TAX_BRACKETS_PATH) if TAX_BRACKETS_PATH else NO_BRACKETS
+        self.rate_schedule = load_rate_schedule(RATE_RULES_PATH) if RATE_RULES_PATH else NO_RATE_RULES
+        
+        self.money_rain.spawn_batch(MONEY_RAIN_COUNT)
         
         self.wage_input = InputBox(150, 150, 300, 50, "Hourly Wage ($)", "15.00")
-        self.tax_input = InputBox(150, 250, 300, 50, "Tax Rate (%)", "25")
+        if self.tax_schedule:
+            self.tax_input = InputBox(150, 250, 300, 50, "Extra Tax Rate (%)", "0")
+        else:
+            self.tax_input = InputBox(150, 250, 300, 50, "Tax Rate (%)", "25")
         self.time_input = InputBox(150, 350, 300, 50, "Clock-In Time (HH:MM)", "09:00")
         self.clock_in_btn = Button(175, 450, 250, 60, "Clock In", GREEN, DARK_GREEN)
         self.clock_out_btn = Button(175, 450, 250, 60, "Clock Out", GREEN, DARK_GREEN)
-        self.new_shift_btn = Button(175, 450, 250, 60, "New Shift", BLUE, (37, 99, 235))
+        self.new_shift_btn = Button(50, 460, 160, 60, "New Shift", BLUE, (37, 99, 235))
+        self.export_btn = Button(220, 460, 160, 60, "Export", GRAY, (107, 114, 128))
+        self.history_btn = Button(390, 460, 160, 60, "History", GREEN, DARK_GREEN)
+        self.back_btn = Button(175, 470, 250, 60, "Back", BLUE, (37, 99, 235))
+        self.period_toggle = ToggleButton(200, 185, 200, 36, "Monthly", "Weekly")
         self.tax_toggle = ToggleButton(200, 410, 200, 40, "After Tax", "Before Tax")
+        self.widgets = (
+            self.wage_input, self.tax_input, self.time_input, self.clock_in_btn, self.clock_out_btn,
+            self.new_shift_btn, self.export_btn, self.history_btn, self.back_btn, self.period_toggle, self.tax_toggle,
+        )
     
-    def parse_time(self, time_str):
-        try:
-            hours, minutes = map(int, time_str.split(':'))
-            now = datetime.now()
-            clock_in = now.replace(hour=hours, minute=minutes, second=0, microsecond=0)
-            
-            if clock_in > now:
-                clock_in -= timedelta(days=1)
-            
-            return clock_in
-        except:
-            return None
+    def apply_ui_scale(self):
+        # Called once the canvas has a new size: widgets are laid out again and
+        # the cached screens are rebuilt at the new scale on the next frame
+        for widget in self.widgets:
+            widget.rescale()
+        self.tracking_overlay = None
+        self.tracking_overlay_key = None
+        self.tracking_dirty_rects = None
+        self.static_screen = None
+        self.static_screen_key = None
+        self.static_screen_stale = True
+    
+    @property
+    def hourly_wage(self):
+        return self.engine.hourly_wage if self.engine else None
+    
+    @property
+    def tax_rate(self):
+        return self.engine.tax_rate if self.engine else 0.25
+    
+    @property
+    def start_time(self):
+        return self.engine.start_time if self.engine else None
     
     def calculate_earnings(self):
-        if not self.start_time or not self.hourly_wage:
+        if not self.engine:
             return 0, 0
         
-        elapsed = datetime.now() - self.start_time
-        total_minutes = int(elapsed.total_seconds() / 60)
-        hours = total_minutes / 60
-        
-        # Calculate earnings based on completed minutes only
-        earnings = (total_minutes / 60) * self.hourly_wage
+        earnings, hours = self.engine.calculate_earnings()
         
         # Check for item milestones
-        for price, item_name in self.milestone_items:
-            if earnings >= price and price not in self.unlocked_items:
-                self.unlocked_items.add(price)
-                self.milestone_messages.append(FadingMilestone(item_name, WIDTH // 2, 280))
+        for price, item_name in self.engine.unlock_milestones(earnings):
+            self.milestone_messages.spawn(item_name, WIDTH // 2, 280)
         
         return earnings, hours
     
@@ -375,57 +1034,48 @@ class WageTracker:
         self.minute_celebration_active = True
         self.minute_celebration_timer = 0
         self.minute_amount = amount
-        for _ in range(50):
-            self.confetti.append(Confetti())
+        self.confetti.spawn_batch(CONFETTI_PER_CELEBRATION)
     
     def get_rainbow_color(self, offset):
-        hue = (offset % 360) / 360.0
-        h = hue * 6
-        c = 1
-        x = 1 - abs(h % 2 - 1)
-        if h < 1:
-            r, g, b = c, x, 0
-        elif h < 2:
-            r, g, b = x, c, 0
-        elif h < 3:
-            r, g, b = 0, c, x
-        elif h < 4:
-            r, g, b = 0, x, c
-        elif h < 5:
-            r, g, b = x, 0, c
-        else:
-            r, g, b = c, 0, x
-        return (int(r * 255), int(g * 255), int(b * 255))
+        return get_rainbow_lut()[int(offset * RAINBOW_STEPS_PER_DEGREE) % len(_rainbow_lut)]
     
     def check_minute_update(self):
-        if not self.start_time:
+        if not self.engine:
             return
         
-        elapsed = datetime.now() - self.start_time
-        current_minute = int(elapsed.total_seconds() / 60)
-        
-        if current_minute > self.last_update_minute:
-            increment = self.hourly_wage / 60
-            self.increments.append(FadingIncrement(increment, WIDTH // 2 - 50, 180))
-            self.last_update_minute = current_minute
-            # Trigger celebration showing the per-minute earnings
+        clocking_in = self.engine.last_update_minute < 0
+        increment = self.engine.check_minute_update()
+        if increment is None:
+            return
+        self.save_checkpoint()
+        self.publish_status()
+        if increment > 0:
+            # Celebrate the cents actually earned since the last minute
+            self.increments.spawn(increment, WIDTH // 2 - 50, 180)
             self.trigger_minute_celebration(increment)
+        elif clocking_in:
+            # Nothing is earned yet at clock-in, so the opening celebration
+            # shows what the first minute will pay instead
+            minute = self.engine.last_update_minute
+            self.trigger_minute_celebration(
+                self.engine.rates.earnings_cents(minute + 1) - self.engine.rates.earnings_cents(minute)
+            )
     
-    def draw_setup_screen(self):
-        screen.fill(LIGHT_GREEN)
+    def draw_setup_screen(self, surface):
+        surface.fill(LIGHT_GREEN)
         
-        title = title_font.render("Wage Tracker", True, BLACK)
-        title_rect = title.get_rect(center=(WIDTH // 2, 60))
-        screen.blit(title, title_rect)
+        title = render_text(title_font, "Wage Tracker", True, BLACK)
+        title_rect = title.get_rect(center=(px(WIDTH // 2), px(60)))
+        surface.blit(title, title_rect)
         
-        subtitle = small_font.render("Watch your earnings grow every minute", True, GRAY)
-        subtitle_rect = subtitle.get_rect(center=(WIDTH // 2, 100))
-        screen.blit(subtitle, subtitle_rect)
+        subtitle = render_text(small_font, "Watch your earnings grow every minute", True, GRAY)
+        subtitle_rect = subtitle.get_rect(center=(px(WIDTH // 2), px(100)))
+        surface.blit(subtitle, subtitle_rect)
         
-        self.wage_input.draw(screen)
-        self.tax_input.draw(screen)
-        self.time_input.draw(screen)
-        self.clock_in_btn.draw(screen)
+        self.wage_input.draw(surface)
+        self.tax_input.draw(surface)
+        self.time_input.draw(surface)
+        self.clock_in_btn.draw(surface)
     
     def draw_tracking_screen(self):
         # Handle per-minute celebration
@@ -433,242 +1083,551 @@ class WageTracker:
             self.minute_celebration_timer += 1
             self.rainbow_offset = (self.rainbow_offset + 5) % 360
             
-            intensity = max(0, 15 - self.minute_celebration_timer * 0.1)
-            self.shake_offset_x = random.randint(-int(intensity), int(intensity))
-            self.shake_offset_y = random.randint(-int(intensity), int(intensity))
+            intensity = int(max(0, 15 - self.minute_celebration_timer * 0.1)) if self.shake_enabled else 0
+            if intensity:
+                self.shake_offset_x = random.randint(-intensity, intensity)
+                self.shake_offset_y = random.randint(-intensity, intensity)
+            else:
+                self.shake_offset_x = 0
+                self.shake_offset_y = 0
             
             if self.minute_celebration_timer > 180:
                 self.minute_celebration_active = False
-                self.confetti = []
+                self.confetti.clear()
                 self.shake_offset_x = 0
                 self.shake_offset_y = 0
         else:
             self.shake_offset_x = 0
             self.shake_offset_y = 0
         
-        draw_surface = pygame.Surface((WIDTH, HEIGHT))
-        
-        if self.minute_celebration_active:
-            for i in range(HEIGHT):
-                color = self.get_rainbow_color(self.rainbow_offset + i * 0.5)
-                pygame.draw.line(draw_surface, color, (0, i), (WIDTH, i))
-        else:
-            draw_surface.fill(LIGHT_GREEN)
-        
         earnings, hours = self.calculate_earnings()
         
         self.check_minute_update()
+        self.profiler.mark('earnings')
         
-        for money in self.money_rain:
-            money.update()
-            money.draw(draw_surface)
+        self.money_rain.update()
+        self.profiler.mark('money_update')
         
-        self.increments = [inc for inc in self.increments if inc.update()]
+        self.increments.update()
         
         # Update milestone messages with stacking
-        updated_messages = []
-        for i, msg in enumerate(self.milestone_messages):
-            if msg.update(y_offset=i * 40):  # Stack them 40 pixels apart
-                updated_messages.append(msg)
-        self.milestone_messages = updated_messages
+        self.milestone_messages.update(stack_spacing=40)  # Stack them 40 pixels apart
+        self.profiler.mark('milestones')
         
-        self.confetti = [c for c in self.confetti if c.update()]
-        for c in self.confetti:
-            c.draw(draw_surface)
+        self.confetti.update()
+        self.profiler.mark('confetti')
         
-        title_color = BLACK  # Always use black for better visibility
-        display_earnings = earnings * (1 - self.tax_rate) if self.tax_toggle.is_on else earnings
-        title_text = "After Tax Earnings" if self.tax_toggle.is_on else "Before Tax Earnings"
-        title = medium_font.render(title_text, True, title_color)
-        title_rect = title.get_rect(center=(WIDTH // 2, 50))
-        draw_surface.blit(title, title_rect)
+        # Display strings only change when the accumulator moves to a new minute
+        totals = self.engine.earnings
+        display_text = totals.after_tax_text if self.tax_toggle.is_on else totals.earnings_text
+        earnings_surf = render_text(large_font, display_text, True, GREEN)
+        earnings_rect = earnings_surf.get_rect(center=(px(WIDTH // 2), px(150)))
         
-        earnings_text = f"${display_earnings:.2f}"
-        earnings_surf = large_font.render(earnings_text, True, GREEN)
-        earnings_rect = earnings_surf.get_rect(center=(WIDTH // 2, 150))
+        texts = []
+        next_text = self.next_milestone_text()
+        if next_text:
+            next_surf = render_text(small_font, next_text, True, GRAY)
+            texts.append((next_surf, next_surf.get_rect(center=(px(WIDTH // 2), px(530)))))
         
-        bg_rect = pygame.Rect(50, 100, WIDTH - 100, 120)
         if self.minute_celebration_active:
-            pulse = abs(math.sin(self.minute_celebration_timer * 0.1)) * 10
-            bg_rect = pygame.Rect(50 - pulse, 100 - pulse/2, WIDTH - 100 + pulse*2, 120 + pulse)
-            border_color = self.get_rainbow_color(self.rainbow_offset + 180)
-            # Draw solid white background with extra opacity during celebration
-            pygame.draw.rect(draw_surface, WHITE, bg_rect, border_radius=15)
-            pygame.draw.rect(draw_surface, border_color, bg_rect, 5, border_radius=15)
+            self.draw_tracking_celebration(earnings_surf, earnings_rect, texts)
+            return None
+        
+        # Dynamic text drawn on top of the static panels
+        texts.append((earnings_surf, earnings_rect))
+        
+        # Calculate actual elapsed time
+        elapsed = self.engine.elapsed()
+        total_seconds = int(elapsed.total_seconds())
+        h = total_seconds // 3600
+        m = (total_seconds % 3600) // 60
+        s = total_seconds % 60
+        time_text = f"Time: {h}h {m}m {s}s"
+        time_surf = render_text(small_font, time_text, True, GRAY)
+        texts.append((time_surf, time_surf.get_rect(center=(px(WIDTH // 2), px(240)))))
+        
+        # Show tax deduction info
+        if self.tax_toggle.is_on:
+            tax_text = f"(Taxes: -{totals.tax_text})"
+            tax_surf = render_text(small_font, tax_text, True, RED)
+            texts.append((tax_surf, tax_surf.get_rect(center=(px(WIDTH // 2), px(265)))))
+        self.profiler.mark('text')
+        
+        overlay_key = (
+            self.tax_toggle.is_on, self.tax_toggle.is_hovered, self.clock_out_btn.is_hovered,
+            self.engine.earnings.rate_cents, self.start_time,
+        )
+        full_redraw = self.tracking_dirty_rects is None or overlay_key != self.tracking_overlay_key
+        if overlay_key != self.tracking_overlay_key:
+            self.build_tracking_overlay()
+            self.tracking_overlay_key = overlay_key
+        self.profiler.mark('panels')
+        
+        drawn_rects = self.money_rain.get_rects()
+        drawn_rects += self.confetti.get_rects()
+        drawn_rects += [rect for _, rect in texts]
+        drawn_rects += self.increments.get_rects()
+        drawn_rects += self.milestone_messages.get_rects()
+        
+        if full_redraw:
+            dirty_rects = [SCREEN_RECT.copy()]
         else:
-            pygame.draw.rect(draw_surface, WHITE, bg_rect, border_radius=15)
-            pygame.draw.rect(draw_surface, GREEN, bg_rect, 3, border_radius=15)
+            dirty_rects = merge_rects(self.tracking_dirty_rects + drawn_rects)
+        self.profiler.mark('dirty_rects')
+        
+        # Restore the background under everything that moved, redraw the moving
+        # content, then put the static panels back on top of it
+        for rect in dirty_rects:
+            screen.fill(LIGHT_GREEN, rect)
+        self.money_rain.draw(screen)
+        self.profiler.mark('money_draw')
+        self.confetti.draw(screen)
+        self.profiler.mark('confetti')
+        for rect in dirty_rects:
+            screen.blit(self.tracking_overlay, rect, rect)
+        self.profiler.mark('panels')
+        
+        for text_surf, text_rect in texts:
+            screen.blit(text_surf, text_rect)
+        for inc in self.increments:
+            inc.draw(screen)
+        self.profiler.mark('text')
+        
+        # Draw milestone messages LAST so they're on top
+        for msg in self.milestone_messages:
+            msg.draw(screen)
+        self.profiler.mark('milestones')
+        
+        self.tracking_dirty_rects = drawn_rects
+        return None if full_redraw else dirty_rects
+    
+    def build_tracking_overlay(self):
+        if self.tracking_overlay is None:
+            self.tracking_overlay = pygame.Surface(SCREEN_RECT.size, pygame.SRCALPHA)
+        self.tracking_overlay.fill((0, 0, 0, 0))
+        
+        bg_rect = scaled_rect(50, 100, WIDTH - 100, 120)
+        pygame.draw.rect(self.tracking_overlay, WHITE, bg_rect, border_radius=px(15))
+        pygame.draw.rect(self.tracking_overlay, GREEN, bg_rect, px(3), border_radius=px(15))
+        
+        self.draw_tracking_panels(self.tracking_overlay)
+    
+    def next_milestone_text(self):
+        # The engine hands back the same ETA tuple until it changes, so the
+        # string is only rebuilt once a minute at most
+        eta = self.engine.next_milestone_eta()
+        if eta is not self.next_milestone_eta:
+            self.next_milestone_eta = eta
+            self.next_milestone_label = None
+            if eta is not None:
+                item_name, minutes = eta
+                h, m = divmod(minutes, 60)
+                self.next_milestone_label = (
+                    f"Next: {item_name} in {h}h {m}m" if h else f"Next: {item_name} in {m} min"
+                )
+        return self.next_milestone_label
+    
+    def draw_tracking_celebration(self, earnings_surf, earnings_rect, texts):
+        # Drawn straight into the display surface; shake is applied at the end
+        draw_surface = screen
+        
+        strip_y = int(self.rainbow_offset * RAINBOW_STEPS_PER_DEGREE) % len(get_rainbow_lut())
+        draw_surface.blit(get_rainbow_strip(), (0, 0), pygame.Rect((0, strip_y), SCREEN_RECT.size))
+        self.profiler.mark('background')
+        
+        self.money_rain.draw(draw_surface)
+        self.profiler.mark('money_draw')
+        
+        self.confetti.draw(draw_surface)
+        self.profiler.mark('confetti')
+        
+        pulse = abs(math.sin(self.minute_celebration_timer * 0.1)) * 10
+        bg_rect = scaled_rect(50 - pulse, 100 - pulse/2, WIDTH - 100 + pulse*2, 120 + pulse)
+        border_color = self.get_rainbow_color(self.rainbow_offset + 180)
+        # Draw solid white background with extra opacity during celebration
+        pygame.draw.rect(draw_surface, WHITE, bg_rect, border_radius=px(15))
+        pygame.draw.rect(draw_surface, border_color, bg_rect, px(5), border_radius=px(15))
         
         draw_surface.blit(earnings_surf, earnings_rect)
         
         for inc in self.increments:
             inc.draw(draw_surface)
         
-        if self.minute_celebration_active:
-            congrats = title_font.render(f"${self.minute_amount:.2f}!", True, (255, 215, 0))
-            congrats_rect = congrats.get_rect(center=(WIDTH // 2, 260))
-            # Add black shadow for better visibility on rainbow background
-            shadow = title_font.render(f"${self.minute_amount:.2f}!", True, BLACK)
-            draw_surface.blit(shadow, (congrats_rect.x + 3, congrats_rect.y + 3))
-            draw_surface.blit(congrats, congrats_rect)
-        else:
-            # Calculate actual elapsed time
-            elapsed = datetime.now() - self.start_time
-            total_seconds = int(elapsed.total_seconds())
-            h = total_seconds // 3600
-            m = (total_seconds % 3600) // 60
-            s = total_seconds % 60
-            time_text = f"Time: {h}h {m}m {s}s"
-            time_surf = small_font.render(time_text, True, GRAY)
-            time_rect = time_surf.get_rect(center=(WIDTH // 2, 240))
-            draw_surface.blit(time_surf, time_rect)
-            
-            # Show tax deduction info
-            if self.tax_toggle.is_on:
-                tax_amount = earnings * self.tax_rate
-                tax_text = f"(Taxes: -${tax_amount:.2f})"
-                tax_surf = small_font.render(tax_text, True, RED)
-                tax_rect = tax_surf.get_rect(center=(WIDTH // 2, 265))
-                draw_surface.blit(tax_surf, tax_rect)
+        congrats = render_text(title_font, f"${format_cents(self.minute_amount)}!", True, (255, 215, 0))
+        congrats_rect = congrats.get_rect(center=(px(WIDTH // 2), px(260)))
+        # Add black shadow for better visibility on rainbow background
+        shadow = render_text(title_font, f"${format_cents(self.minute_amount)}!", True, BLACK)
+        draw_surface.blit(shadow, (congrats_rect.x + px(3), congrats_rect.y + px(3)))
+        draw_surface.blit(congrats, congrats_rect)
         
-        info_y = 300
-        rate_rect = pygame.Rect(50, info_y, 160, 80)
-        pygame.draw.rect(draw_surface, LIGHT_GRAY, rate_rect, border_radius=10)
-        rate_label = small_font.render("Hourly Rate", True, GRAY)
-        rate_value = medium_font.render(f"${self.hourly_wage:.2f}/hr", True, BLACK)
-        draw_surface.blit(rate_label, (rate_rect.centerx - rate_label.get_width() // 2, rate_rect.y + 15))
-        draw_surface.blit(rate_value, (rate_rect.centerx - rate_value.get_width() // 2, rate_rect.y + 45))
-        
-        minute_rect = pygame.Rect(230, info_y, 160, 80)
-        pygame.draw.rect(draw_surface, LIGHT_GRAY, minute_rect, border_radius=10)
-        minute_label = small_font.render("Per Minute", True, GRAY)
-        per_minute = self.hourly_wage / 60
-        minute_value = medium_font.render(f"${per_minute:.2f}/min", True, BLACK)
-        draw_surface.blit(minute_label, (minute_rect.centerx - minute_label.get_width() // 2, minute_rect.y + 15))
-        draw_surface.blit(minute_value, (minute_rect.centerx - minute_value.get_width() // 2, minute_rect.y + 45))
-        
-        time_rect = pygame.Rect(410, info_y, 140, 80)
-        pygame.draw.rect(draw_surface, LIGHT_GRAY, time_rect, border_radius=10)
-        time_label = small_font.render("Clocked In", True, GRAY)
-        time_value = small_font.render(self.start_time.strftime("%I:%M %p"), True, BLACK)
-        draw_surface.blit(time_label, (time_rect.centerx - time_label.get_width() // 2, time_rect.y + 15))
-        draw_surface.blit(time_value, (time_rect.centerx - time_value.get_width() // 2, time_rect.y + 45))
-        
-        self.tax_toggle.draw(draw_surface)
-        self.clock_out_btn.draw(draw_surface)
+        self.profiler.mark('text')
+        
+        self.draw_tracking_panels(draw_surface)
+        self.profiler.mark('panels')
+        
+        for text_surf, text_rect in texts:
+            draw_surface.blit(text_surf, text_rect)
         
         # Draw milestone messages LAST so they're on top
         for msg in self.milestone_messages:
             msg.draw(draw_surface)
+        self.profiler.mark('milestones')
         
-        screen.fill(BLACK)
-        screen.blit(draw_surface, (self.shake_offset_x, self.shake_offset_y))
+        shake_frame(screen, px(self.shake_offset_x), px(self.shake_offset_y))
+        # The whole window changes while celebrating, so start over afterwards
+        self.tracking_dirty_rects = None
     
-    def draw_summary_screen(self):
-        screen.fill(LIGHT_GREEN)
+    def draw_tracking_panels(self, surface):
+        title_color = BLACK  # Always use black for better visibility
+        title_text = "After Tax Earnings" if self.tax_toggle.is_on else "Before Tax Earnings"
+        title = render_text(medium_font, title_text, True, title_color)
+        title_rect = title.get_rect(center=(px(WIDTH // 2), px(50)))
+        surface.blit(title, title_rect)
+        
+        info_y = 300
+        rate_rect = scaled_rect(50, info_y, 160, 80)
+        pygame.draw.rect(surface, LIGHT_GRAY, rate_rect, border_radius=px(10))
+        rate_label = render_text(small_font, "Hourly Rate", True, GRAY)
+        rate_value = render_text(medium_font, f"${self.engine.hourly_rate():.2f}/hr", True, BLACK)
+        surface.blit(rate_label, (rate_rect.centerx - rate_label.get_width() // 2, rate_rect.y + px(15)))
+        surface.blit(rate_value, (rate_rect.centerx - rate_value.get_width() // 2, rate_rect.y + px(45)))
         
-        title = title_font.render("Shift Complete!", True, BLACK)
-        title_rect = title.get_rect(center=(WIDTH // 2, 50))
-        screen.blit(title, title_rect)
+        minute_rect = scaled_rect(230, info_y, 160, 80)
+        pygame.draw.rect(surface, LIGHT_GRAY, minute_rect, border_radius=px(10))
+        minute_label = render_text(small_font, "Per Minute", True, GRAY)
+        per_minute = self.engine.per_minute
+        minute_value = render_text(medium_font, f"${per_minute:.2f}/min", True, BLACK)
+        surface.blit(minute_label, (minute_rect.centerx - minute_label.get_width() // 2, minute_rect.y + px(15)))
+        surface.blit(minute_value, (minute_rect.centerx - minute_value.get_width() // 2, minute_rect.y + px(45)))
         
-        earnings_label = small_font.render("Total Earnings (Before Tax)", True, GRAY)
-        earnings_label_rect = earnings_label.get_rect(center=(WIDTH // 2, 110))
-        screen.blit(earnings_label, earnings_label_rect)
+        time_rect = scaled_rect(410, info_y, 140, 80)
+        pygame.draw.rect(surface, LIGHT_GRAY, time_rect, border_radius=px(10))
+        time_label = render_text(small_font, "Clocked In", True, GRAY)
+        time_value = render_text(small_font, self.start_time.strftime("%I:%M %p"), True, BLACK)
+        surface.blit(time_label, (time_rect.centerx - time_label.get_width() // 2, time_rect.y + px(15)))
+        surface.blit(time_value, (time_rect.centerx - time_value.get_width() // 2, time_rect.y + px(45)))
         
-        earnings_text = f"${self.final_earnings:.2f}"
-        earnings_surf = large_font.render(earnings_text, True, GREEN)
-        earnings_rect = earnings_surf.get_rect(center=(WIDTH // 2, 160))
+        self.tax_toggle.draw(surface)
+        self.clock_out_btn.draw(surface)
+    
+    def draw_summary_screen(self, surface):
+        surface.fill(LIGHT_GREEN)
         
-        bg_rect = pygame.Rect(50, 130, WIDTH - 100, 80)
-        pygame.draw.rect(screen, WHITE, bg_rect, border_radius=15)
-        pygame.draw.rect(screen, GREEN, bg_rect, 3, border_radius=15)
-        screen.blit(earnings_surf, earnings_rect)
+        title = render_text(title_font, "Shift Complete!", True, BLACK)
+        title_rect = title.get_rect(center=(px(WIDTH // 2), px(50)))
+        surface.blit(title, title_rect)
+        
+        earnings_label = render_text(small_font, "Total Earnings (Before Tax)", True, GRAY)
+        earnings_label_rect = earnings_label.get_rect(center=(px(WIDTH // 2), px(110)))
+        surface.blit(earnings_label, earnings_label_rect)
+        
+        totals = self.engine.earnings
+        earnings_surf = render_text(large_font, totals.earnings_text, True, GREEN)
+        earnings_rect = earnings_surf.get_rect(center=(px(WIDTH // 2), px(160)))
+        
+        bg_rect = scaled_rect(50, 130, WIDTH - 100, 80)
+        pygame.draw.rect(surface, WHITE, bg_rect, border_radius=px(15))
+        pygame.draw.rect(surface, GREEN, bg_rect, px(3), border_radius=px(15))
+        surface.blit(earnings_surf, earnings_rect)
         
         # After tax earnings
-        after_tax = self.final_earnings * (1 - self.tax_rate)
-        tax_amount = self.final_earnings * self.tax_rate
-        
-        after_tax_label = small_font.render("After Tax", True, GRAY)
-        after_tax_label_rect = after_tax_label.get_rect(center=(WIDTH // 2, 225))
-        screen.blit(after_tax_label, after_tax_label_rect)
-        
-        after_tax_text = f"${after_tax:.2f}"
-        after_tax_surf = medium_font.render(after_tax_text, True, DARK_GREEN)
-        after_tax_rect = after_tax_surf.get_rect(center=(WIDTH // 2, 255))
-        screen.blit(after_tax_surf, after_tax_rect)
-        
-        tax_text = f"(Tax: -${tax_amount:.2f} at {int(self.tax_rate * 100)}%)"
-        tax_surf = small_font.render(tax_text, True, RED)
-        tax_rect = tax_surf.get_rect(center=(WIDTH // 2, 280))
-        screen.blit(tax_surf, tax_rect)
-        
-        hours_rect = pygame.Rect(50, 310, 240, 70)
-        pygame.draw.rect(screen, WHITE, hours_rect, border_radius=10)
-        pygame.draw.rect(screen, GRAY, hours_rect, 2, border_radius=10)
-        hours_label = small_font.render("Hours Worked", True, GRAY)
+        after_tax_label = render_text(small_font, "After Tax", True, GRAY)
+        after_tax_label_rect = after_tax_label.get_rect(center=(px(WIDTH // 2), px(225)))
+        surface.blit(after_tax_label, after_tax_label_rect)
+        
+        after_tax_surf = render_text(medium_font, totals.after_tax_text, True, DARK_GREEN)
+        after_tax_rect = after_tax_surf.get_rect(center=(px(WIDTH // 2), px(255)))
+        surface.blit(after_tax_surf, after_tax_rect)
+        
+        if self.engine.tax_schedule:
+            effective_rate = totals.tax_cents / totals.cents if totals.cents else 0
+            tax_text = f"(Tax: -{totals.tax_text}, {effective_rate * 100:.1f}% effective)"
+        else:
+            tax_text = f"(Tax: -{totals.tax_text} at {int(self.tax_rate * 100)}%)"
+        tax_surf = render_text(small_font, tax_text, True, RED)
+        tax_rect = tax_surf.get_rect(center=(px(WIDTH // 2), px(280)))
+        surface.blit(tax_surf, tax_rect)
+        
+        hours_rect = scaled_rect(50, 310, 240, 70)
+        pygame.draw.rect(surface, WHITE, hours_rect, border_radius=px(10))
+        pygame.draw.rect(surface, GRAY, hours_rect, px(2), border_radius=px(10))
+        hours_label = render_text(small_font, "Hours Worked", True, GRAY)
         h = int(self.total_hours)
         m = int((self.total_hours - h) * 60)
-        hours_value = medium_font.render(f"{h}h {m}m", True, BLACK)
-        screen.blit(hours_label, (hours_rect.centerx - hours_label.get_width() // 2, hours_rect.y + 12))
-        screen.blit(hours_value, (hours_rect.centerx - hours_value.get_width() // 2, hours_rect.y + 38))
-        
-        rate_rect = pygame.Rect(310, 310, 240, 70)
-        pygame.draw.rect(screen, WHITE, rate_rect, border_radius=10)
-        pygame.draw.rect(screen, GRAY, rate_rect, 2, border_radius=10)
-        rate_label = small_font.render("Hourly Rate", True, GRAY)
-        rate_value = medium_font.render(f"${self.hourly_wage:.2f}/hr", True, BLACK)
-        screen.blit(rate_label, (rate_rect.centerx - rate_label.get_width() // 2, rate_rect.y + 12))
-        screen.blit(rate_value, (rate_rect.centerx - rate_value.get_width() // 2, rate_rect.y + 38))
-        
-        in_rect = pygame.Rect(50, 400, 240, 50)
-        pygame.draw.rect(screen, LIGHT_GRAY, in_rect, border_radius=8)
-        in_label = small_font.render("Clock In:", True, GRAY)
-        in_value = small_font.render(self.start_time.strftime("%I:%M %p"), True, BLACK)
-        screen.blit(in_label, (in_rect.x + 15, in_rect.y + 7))
-        screen.blit(in_value, (in_rect.x + 15, in_rect.y + 27))
-        
-        out_rect = pygame.Rect(310, 400, 240, 50)
-        pygame.draw.rect(screen, LIGHT_GRAY, out_rect, border_radius=8)
-        out_label = small_font.render("Clock Out:", True, GRAY)
-        out_value = small_font.render(self.end_time.strftime("%I:%M %p"), True, BLACK)
-        screen.blit(out_label, (out_rect.x + 15, out_rect.y + 7))
-        screen.blit(out_value, (out_rect.x + 15, out_rect.y + 27))
-        
-        self.new_shift_btn.draw(screen)
+        hours_value = render_text(medium_font, f"{h}h {m}m", True, BLACK)
+        surface.blit(hours_label, (hours_rect.centerx - hours_label.get_width() // 2, hours_rect.y + px(12)))
+        surface.blit(hours_value, (hours_rect.centerx - hours_value.get_width() // 2, hours_rect.y + px(38)))
+        
+        rate_rect = scaled_rect(310, 310, 240, 70)
+        pygame.draw.rect(surface, WHITE, rate_rect, border_radius=px(10))
+        pygame.draw.rect(surface, GRAY, rate_rect, px(2), border_radius=px(10))
+        rate_label = render_text(small_font, "Hourly Rate", True, GRAY)
+        rate_value = render_text(medium_font, f"${self.hourly_wage:.2f}/hr", True, BLACK)
+        surface.blit(rate_label, (rate_rect.centerx - rate_label.get_width() // 2, rate_rect.y + px(12)))
+        surface.blit(rate_value, (rate_rect.centerx - rate_value.get_width() // 2, rate_rect.y + px(38)))
+        
+        in_rect = scaled_rect(50, 400, 240, 50)
+        pygame.draw.rect(surface, LIGHT_GRAY, in_rect, border_radius=px(8))
+        in_label = render_text(small_font, "Clock In:", True, GRAY)
+        in_value = render_text(small_font, self.start_time.strftime("%I:%M %p"), True, BLACK)
+        surface.blit(in_label, (in_rect.x + px(15), in_rect.y + px(7)))
+        surface.blit(in_value, (in_rect.x + px(15), in_rect.y + px(27)))
+        
+        out_rect = scaled_rect(310, 400, 240, 50)
+        pygame.draw.rect(surface, LIGHT_GRAY, out_rect, border_radius=px(8))
+        out_label = render_text(small_font, "Clock Out:", True, GRAY)
+        out_value = render_text(small_font, self.end_time.strftime("%I:%M %p"), True, BLACK)
+        surface.blit(out_label, (out_rect.x + px(15), out_rect.y + px(7)))
+        surface.blit(out_value, (out_rect.x + px(15), out_rect.y + px(27)))
+        
+        self.new_shift_btn.draw(surface)
+        self.export_btn.draw(surface)
+        self.history_btn.draw(surface)
     
-    def handle_clock_in(self):
+    def open_history(self):
+        if self.analytics is None:
+            if ShiftAnalytics is None:
+                print("The history screen needs NumPy")
+                return
+            try:
+                history = self.get_history()
+                if history is None:
+                    print("Shift history is turned off")
+                    return
+                self.analytics = ShiftAnalytics.from_history(history)
+            except (OSError, sqlite3.Error) as e:
+                print(f"Could not load shift history: {e}")
+                return
+            # Later shifts are folded into the aggregates as they are saved
+            history.subscribe(self.analytics.append)
+        self.show_history = True
+    
+    def export_shifts(self):
+        # The whole history as CSV, plus every shift's per-minute timeline in a
+        # columnar file (Parquet when pyarrow is installed, .npy otherwise).
+        # Large histories take seconds, so the files are written on a worker
+        # thread and the window keeps drawing until EXPORT_DONE comes back
+        if export_history is None:
+            print("Exporting needs NumPy")
+            return
+        if self.export_thread is not None:
+            print("An export is already running")
+            return
+        try:
+            history = self.get_history()
+            if history is None:
+                print("Shift history is turned off")
+                return
+            # The worker reads through its own connection, which only sees
+            # committed rows
+            history.flush()
+        except (OSError, sqlite3.Error) as e:
+            print(f"Could not export shift history: {e}")
+            return
+        self.export_thread = threading.Thread(
+            target=self.export_worker, args=(self.clock(),), name='shift-export', daemon=True
+        )
+        self.export_thread.start()
+    
+    def export_worker(self, now):
+        # SQLite connections stay on the thread that opened them
+        written = []
+        error = None
         try:
-            wage = float(self.wage_input.text)
-            tax_rate = float(self.tax_input.text) / 100
-            clock_in = self.parse_time(self.time_input.text)
+            os.makedirs(EXPORT_DIR, exist_ok=True)
+            with ShiftHistory(self.history_path) as history:
+                for kind, ext, timeline in (('shifts', '.csv', False), ('timeline', '.parquet', True)):
+                    written.append(export_history(
+                        history, os.path.join(EXPORT_DIR, export_name(kind, ext, now)), timeline,
+                        rate_schedule=self.rate_schedule,
+                    ))
+        except (OSError, ValueError, sqlite3.Error) as e:
+            error = e
+        pygame.event.post(pygame.event.Event(EXPORT_DONE, written=written, error=error))
+    
+    def finish_export(self, event):
+        self.export_thread.join()
+        self.export_thread = None
+        for path, rows, drifted in event.written:
+            print(f"Exported {rows} rows to {path}")
+            if drifted:
+                print(f"Warning: {drift_warning(drifted)}")
+        if event.error is not None:
+            print(f"Could not export shift history: {event.error}")
+    
+    def draw_history_screen(self, surface):
+        surface.fill(LIGHT_GREEN)
+        
+        title = render_text(title_font, "Pay History", True, BLACK)
+        surface.blit(title, title.get_rect(center=(px(WIDTH // 2), px(40))))
+        
+        summary = self.analytics.summary()
+        panels = [
+            ("Total Earned", f"${format_cents(summary['earnings_cents'], grouping=True)}"),
+            ("After Tax", f"${format_cents(summary['after_tax_cents'], grouping=True)}"),
+            ("Avg Rate", f"${summary['effective_hourly']:.2f}/hr"),
+        ]
+        for i, (label, value) in enumerate(panels):
+            panel_rect = scaled_rect(50 + i * 170, 75, 160, 70)
+            pygame.draw.rect(surface, WHITE, panel_rect, border_radius=px(10))
+            label_surf = render_text(small_font, label, True, GRAY)
+            value_surf = render_text(medium_font, value, True, BLACK)
+            surface.blit(label_surf, (panel_rect.centerx - label_surf.get_width() // 2, panel_rect.y + px(10)))
+            surface.blit(value_surf, (panel_rect.centerx - value_surf.get_width() // 2, panel_rect.y + px(38)))
+        
+        h = int(summary['hours'])
+        counts_text = f"{summary['shifts']} shifts, {h}h worked, {summary['milestones']} milestones"
+        counts_surf = render_text(small_font, counts_text, True, GRAY)
+        surface.blit(counts_surf, counts_surf.get_rect(center=(px(WIDTH // 2), px(165))))
+        
+        self.period_toggle.draw(surface)
+        self.draw_history_chart(surface, scaled_rect(50, 235, WIDTH - 100, 215))
+        self.back_btn.draw(surface)
+    
+    def draw_history_chart(self, surface, rect):
+        # Bars come straight from the pre-aggregated weekly/monthly bins
+        monthly = self.period_toggle.is_on
+        bins = self.analytics.monthly if monthly else self.analytics.weekly
+        keys, earnings = bins.recent(HISTORY_CHART_BARS)
+        
+        pygame.draw.rect(surface, WHITE, rect, border_radius=px(10))
+        if not len(keys):
+            empty = render_text(small_font, "No shifts recorded yet", True, GRAY)
+            surface.blit(empty, empty.get_rect(center=rect.center))
+            return
+        
+        label_font = get_font(px(18))
+        peak = max(int(earnings.max()), 1)  # Cents
+        peak_surf = render_text(label_font, f"${(peak + 50) // 100:,}", True, GRAY)
+        surface.blit(peak_surf, (rect.x + px(10), rect.y + px(8)))
+        
+        bar_area = pygame.Rect(rect.x + px(15), rect.y + px(30), rect.width - px(30), rect.height - px(55))
+        bar_width = bar_area.width // HISTORY_CHART_BARS
+        for i, (key, amount) in enumerate(zip(keys.tolist(), earnings.tolist())):
+            bar_height = max(1, int(bar_area.height * amount / peak))
+            bar = pygame.Rect(bar_area.x + i * bar_width + px(4), bar_area.bottom - bar_height, bar_width - px(8), bar_height)
+            pygame.draw.rect(surface, GREEN, bar, border_radius=px(4))
             
-            if wage > 0 and 0 <= tax_rate <= 1 and clock_in:
-                self.hourly_wage = wage
-                self.tax_rate = tax_rate
-                self.start_time = clock_in
-                self.is_tracking = True
-                self.show_summary = False
-                self.last_update_minute = -1
-                self.increments = []
-                self.last_milestone = 0
-                self.celebration_active = False
-                self.confetti = []
-                self.tax_toggle.is_on = False
-                self.unlocked_items = set()
-                self.milestone_messages = []
-                self.minute_celebration_active = False
-                self.minute_celebration_timer = 0
-                self.minute_amount = 0
-            else:
-                print("Invalid input!")
-        except ValueError:
-            print("Invalid wage or tax rate!")
+            label = month_start(key).strftime("%b") if monthly else week_start(key).strftime("%m/%d")
+            label_surf = render_text(label_font, label, True, GRAY)
+            surface.blit(label_surf, label_surf.get_rect(center=(bar.centerx, rect.bottom - px(12))))
+    
+    def handle_clock_in(self):
+        try:
+            engine = start_shift(
+                self.wage_input.text, self.tax_input.text, self.time_input.text,
+                clock=self.clock, milestone_items=self.milestone_items, tax_schedule=self.tax_schedule,
+                rate_schedule=self.rate_schedule,
+            )
+        except ValueError as e:
+            print(e)
+            return
+        
+        self.start_tracking(engine)
+    
+    def resume_shift(self):
+        # Picks up a shift that was still running when the process last exited
+        checkpoint = self.get_checkpoint()
+        state = checkpoint.load() if checkpoint else None
+        if state is None:
+            return False
+        if is_stale(state, self.clock()):
+            # Resuming would count every hour since the crash as worked
+            print(f"Discarding a shift checkpoint last saved {state['saved_at']:%Y-%m-%d %H:%M}")
+            checkpoint.clear()
+            return False
+        
+        engine = ShiftEngine(
+            state['hourly_wage'], state['tax_rate'], state['start_time'],
+            clock=self.clock, milestone_items=self.milestone_items, tax_schedule=self.tax_schedule,
+            rate_schedule=self.rate_schedule,
+        )
+        engine.last_update_minute = state['last_update_minute']
+        engine.milestones.next_index = min(state['unlocked'], len(engine.milestones))
+        self.start_tracking(engine)
+        return True
+    
+    def start_tracking(self, engine):
+        self.engine = engine
+        self.is_tracking = True
+        self.show_summary = False
+        self.increments.clear()
+        self.last_milestone = 0
+        self.celebration_active = False
+        self.confetti.clear()
+        self.tax_toggle.is_on = False
+        self.milestone_messages.clear()
+        self.minute_celebration_active = False
+        self.minute_celebration_timer = 0
+        self.minute_amount = 0
+        self.tracking_dirty_rects = None
+        self.save_checkpoint()
+        self.publish_status()
     
     def handle_clock_out(self):
-        self.end_time = datetime.now()
+        self.end_time = self.clock()
         self.final_earnings, self.total_hours = self.calculate_earnings()
         self.is_tracking = False
         self.show_summary = True
+        self.save_shift()
+        self.clear_checkpoint()
+        self.publish_status()
+    
+    def get_checkpoint(self):
+        if self.checkpoint is None and self.checkpoint_path:
+            try:
+                self.checkpoint = ShiftCheckpoint(self.checkpoint_path)
+            except (OSError, ValueError) as e:
+                print(f"Could not open shift checkpoint: {e}")
+                self.checkpoint_path = None
+        return self.checkpoint
+    
+    def save_checkpoint(self):
+        checkpoint = self.get_checkpoint()
+        if checkpoint is not None and self.engine is not None:
+            checkpoint.save(self.engine)
+    
+    def clear_checkpoint(self):
+        checkpoint = self.get_checkpoint()
+        if checkpoint is not None:
+            checkpoint.clear()
+    
+    def start_status_server(self):
+        if not self.status_address:
+            return
+        try:
+            self.status = StatusServer(self.status_address)
+            self.status.start()
+        except OSError as e:
+            print(f"Could not start the status endpoint on {self.status_address}: {e}")
+            self.status = None
+            return
+        self.publish_status()
+    
+    def publish_status(self):
+        # Snapshots are only taken on shift changes and minute ticks
+        if self.status is None:
+            return
+        now = self.clock()
+        if self.is_tracking and self.engine is not None:
+            self.status.publish(snapshot_from_engine(self.engine, now))
+        else:
+            self.status.publish(idle_snapshot(now))
+    
+    def get_history(self):
+        if self.history is None and self.history_path:
+            self.history = ShiftHistory(self.history_path)
+        return self.history
+    
+    def save_shift(self):
+        try:
+            history = self.get_history()
+            if history is None:
+                return
+            history.append(record_from_engine(self.engine, self.end_time, self.final_earnings, self.total_hours))
+            history.flush()
+        except (OSError, sqlite3.Error) as e:
+            print(f"Could not save shift history: {e}")
     
     def handle_new_shift(self):
         self.show_summary = False
@@ -676,53 +1635,182 @@ class WageTracker:
         self.wage_input.text = ''
         self.tax_input.text = ''
         self.time_input.text = ''
-        self.start_time = None
+        self.engine = None
         self.end_time = None
         self.final_earnings = 0
         self.total_hours = 0
-        self.unlocked_items = set()
-        self.milestone_messages = []
-        self.last_update_minute = -1
-        self.increments = []
+        self.milestone_messages.clear()
+        self.increments.clear()
         self.last_milestone = 0
         self.celebration_active = False
-        self.confetti = []
+        self.confetti.clear()
         self.minute_celebration_active = False
         self.minute_celebration_timer = 0
         self.minute_amount = 0
     
+    def is_animating(self):
+        if self.show_history or self.show_summary or not self.is_tracking:
+            return False
+        if self.minute_celebration_active or self.confetti or self.increments or self.milestone_messages:
+            return True
+        return len(self.money_rain) > 0 and self.frame_mode != 'eco'
+    
+    def wait_for_events(self):
+        if self.frame_mode == 'fixed' or self.is_animating():
+            clock.tick(FPS)
+            return pygame.event.get()
+        
+        if self.is_tracking and not self.show_summary:
+            # Wake up on the next whole second of the shift so the "Time:" label
+            # and the minute check stay on schedule
+            elapsed_ms = int(self.engine.elapsed().total_seconds() * 1000)
+            timeout = min(1000 // IDLE_FPS, 1000 - elapsed_ms % 1000)
+            event = pygame.event.wait(max(1, timeout))
+        else:
+            # Setup and summary screens only change on input
+            event = pygame.event.wait()
+        
+        clock.tick()
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event] + pygame.event.get()
+    
+    def handle_event(self, event):
+        if event.type == EXPORT_DONE:
+            self.finish_export(event)
+            return
+        if event.type == pygame.VIDEOEXPOSE:
+            self.tracking_dirty_rects = None
+            self.static_screen_stale = True
+        elif event.type == pygame.VIDEORESIZE and display_mode != 'window':
+            resize_display((event.w, event.h))
+            self.apply_ui_scale()
+        elif screen_origin != (0, 0) and hasattr(event, 'pos'):
+            # Widgets hit-test in canvas coordinates
+            x, y = event.pos
+            event = pygame.event.Event(event.type, dict(event.dict, pos=(x - screen_origin[0], y - screen_origin[1])))
+        
+        if event.type == pygame.KEYDOWN and event.key in (pygame.K_F3, pygame.K_F4, pygame.K_F5):
+            if event.key == pygame.K_F3:
+                self.profiler.toggle()
+                # The overlay is drawn over the frame, so repaint everything under it
+                self.tracking_dirty_rects = None
+                self.static_screen_stale = True
+            elif event.key == pygame.K_F4:
+                self.profiler.dump_json()
+            else:
+                self.profiler.toggle_cprofile()
+            return
+        
+        if self.show_history:
+            self.period_toggle.handle_event(event)
+            if self.back_btn.handle_event(event):
+                self.show_history = False
+        elif self.show_summary:
+            if self.new_shift_btn.handle_event(event):
+                self.handle_new_shift()
+            elif self.export_btn.handle_event(event):
+                self.export_shifts()
+            elif self.history_btn.handle_event(event):
+                self.open_history()
+        elif not self.is_tracking:
+            self.wage_input.handle_event(event)
+            self.tax_input.handle_event(event)
+            self.time_input.handle_event(event)
+            if self.clock_in_btn.handle_event(event):
+                self.handle_clock_in()
+        else:
+            self.tax_toggle.handle_event(event)
+            if self.clock_out_btn.handle_event(event):
+                self.handle_clock_out()
+    
+    def get_static_screen_key(self):
+        if self.show_history:
+            return (
+                'history', self.analytics.shift_count, self.period_toggle.is_on, self.period_toggle.is_hovered,
+                self.back_btn.is_hovered,
+            )
+        if self.show_summary:
+            return (
+                'summary', self.end_time, self.new_shift_btn.is_hovered, self.export_btn.is_hovered,
+                self.history_btn.is_hovered,
+            )
+        inputs = (self.wage_input, self.tax_input, self.time_input)
+        return ('setup', self.clock_in_btn.is_hovered) + tuple((box.text, box.active) for box in inputs)
+    
+    def draw_static_screen(self, compose):
+        # Returns [] when the display already shows the current state, or None
+        # after blitting the cached screen for a full flip
+        key = self.get_static_screen_key()
+        if self.static_screen is None:
+            self.static_screen = pygame.Surface(SCREEN_RECT.size)
+            self.static_screen_key = None
+        if key != self.static_screen_key:
+            compose(self.static_screen)
+            self.static_screen_key = key
+            self.static_screen_stale = True
+        
+        # The profiler overlay is redrawn on top every frame, so it needs a clean copy underneath
+        if not self.static_screen_stale and not self.profiler.show_overlay:
+            return []
+        screen.blit(self.static_screen, (0, 0))
+        self.static_screen_stale = False
+        return None
+    
+    def draw_frame(self):
+        if self.show_history:
+            dirty_rects = self.draw_static_screen(self.draw_history_screen)
+        elif self.show_summary:
+            dirty_rects = self.draw_static_screen(self.draw_summary_screen)
+        elif not self.is_tracking:
+            dirty_rects = self.draw_static_screen(self.draw_setup_screen)
+        else:
+            dirty_rects = self.draw_tracking_screen()
+            # Force a full present when we come back to a static screen
+            self.static_screen_stale = True
+        
+        overlay_rect = self.profiler.draw_overlay(screen)
+        if overlay_rect and dirty_rects is not None:
+            dirty_rects.append(overlay_rect)
+        
+        if dirty_rects is None:
+            pygame.display.flip()
+        elif screen_origin != (0, 0):
+            pygame.display.update([rect.move(screen_origin) for rect in dirty_rects])
+        else:
+            pygame.display.update(dirty_rects)
+        self.profiler.mark('present')
+    
     def run(self):
+        init_display()
+        self.apply_ui_scale()
+        self.start_status_server()
+        self.resume_shift()
         running = True
+        events = pygame.event.get()
         
         while running:
-            for event in pygame.event.get():
+            self.profiler.begin_frame()
+            for event in events:
                 if event.type == pygame.QUIT:
                     running = False
-                
-                if self.show_summary:
-                    if self.new_shift_btn.handle_event(event):
-                        self.handle_new_shift()
-                elif not self.is_tracking:
-                    self.wage_input.handle_event(event)
-                    self.tax_input.handle_event(event)
-                    self.time_input.handle_event(event)
-                    if self.clock_in_btn.handle_event(event):
-                        self.handle_clock_in()
-                else:
-                    self.tax_toggle.handle_event(event)
-                    if self.clock_out_btn.handle_event(event):
-                        self.handle_clock_out()
+                self.handle_event(event)
+            self.profiler.mark('events')
             
-            if self.show_summary:
-                self.draw_summary_screen()
-            elif not self.is_tracking:
-                self.draw_setup_screen()
-            else:
-                self.draw_tracking_screen()
+            self.draw_frame()
+            self.profiler.end_frame()
             
-            pygame.display.flip()
-            clock.tick(FPS)
+            events = self.wait_for_events()
         
+        if self.export_thread is not None:
+            # Let a running export finish its files rather than cut them short
+            self.export_thread.join()
+        if self.history is not None:
+            self.history.close()
+        if self.checkpoint is not None:
+            self.checkpoint.close()
+        if self.status is not None:
+            self.status.close()
         pygame.quit()
         sys.exit()
 